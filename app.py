@@ -1,38 +1,45 @@
-from flask import Flask, request, jsonify, send_file, render_template
+from flask import Flask, Request, Response, request, jsonify, send_file, render_template
 from werkzeug.utils import secure_filename
 import os
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 import threading
+import multiprocessing
 import time
 import zipfile
+import zlib
+import hashlib
 import io
 
-from converters import (
-    PDFConverter, DOCXConverter, HTMLConverter, JSONConverter,
-    CSVConverter, XMLConverter, RTFConverter, EPUBConverter, ODTConverter
-)
-from converters.parsers import get_parser, PARSERS
-from converters.validators import get_file_metadata
+from converters import CONVERTERS
+from converters.parsers import PARSERS
+from converters.cache import parse_cache, output_cache
+from converters.validators import get_file_metadata, sniff_content, UploadValidator, SNIFF_BYTES
+from converters.workers import convert_task, WORKER_COUNT
+from jobs import JobManager
+from state import create_state_backend, FILE_TTL
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['OUTPUT_FOLDER'] = 'outputs'
+app.config['BATCH_CONCURRENCY'] = int(os.environ.get('BATCH_CONCURRENCY', WORKER_COUNT))
 
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx', 'html', 'json', 'csv', 'xml', 'rtf', 'epub', 'odt'}
-
-converters = {
-    'pdf': PDFConverter(),
-    'docx': DOCXConverter(),
-    'html': HTMLConverter(),
-    'json': JSONConverter(),
-    'csv': CSVConverter(),
-    'xml': XMLConverter(),
-    'rtf': RTFConverter(),
-    'epub': EPUBConverter(),
-    'odt': ODTConverter(),
-}
+PRECOMPRESSED_EXTENSIONS = {'pdf', 'docx', 'odt', 'epub'}
+ZIP_CHUNK_SIZE = 64 * 1024
+MAX_STORAGE_BYTES = int(os.environ.get('MAX_STORAGE_BYTES', 0))
+EXPIRY_INTERVAL = float(os.environ.get('EXPIRY_INTERVAL', 5))
+EXPIRY_BATCH_SIZE = 500
+FILE_SCAN_INTERVAL = int(os.environ.get('FILE_SCAN_INTERVAL', 6 * 3600))
+UPLOAD_CHUNK_SIZE = min(int(os.environ.get('UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)), app.config['MAX_CONTENT_LENGTH'])
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', 1024 * 1024 * 1024))
+UPLOAD_READ_SIZE = 1024 * 1024
+MAX_ACTIVE_UPLOADS = int(os.environ.get('MAX_ACTIVE_UPLOADS', 32))
+MAX_ACTIVE_UPLOAD_BYTES = int(os.environ.get('MAX_ACTIVE_UPLOAD_BYTES', 4 * 1024 * 1024 * 1024))
+CHUNKED_PART_PREFIX = '.chunked_'
+
+converters = CONVERTERS
 
 def allowed_file(filename):
     if '.' not in filename:
@@ -43,29 +50,333 @@ def allowed_file(filename):
 def get_file_extension(filename):
     return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
 
-def cleanup_old_files():
-    now = datetime.now()
-    for folder in [app.config['UPLOAD_FOLDER'], app.config['OUTPUT_FOLDER']]:
-        if os.path.exists(folder):
-            for filename in os.listdir(folder):
-                filepath = os.path.join(folder, filename)
+class UploadStream:
+    def __init__(self, folder, file_extension):
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f".upload_{uuid.uuid4().hex}.part")
+        self.error = None
+        self.saved = False
+        self._validator = UploadValidator(file_extension)
+        self._sha = hashlib.sha256()
+        self._file = open(self.path, 'w+b')
+    
+    def write(self, data):
+        if self.error is None:
+            try:
+                self._write(self._validator.feed(data))
+            except ValueError as e:
+                self.discard(e)
+        return len(data)
+    
+    def seek(self, offset, whence=0):
+        if self.error is None and not self._file.closed:
+            try:
+                self._write(self._validator.close())
+            except ValueError as e:
+                self.discard(e)
+        return self._file.seek(offset, whence) if not self._file.closed else 0
+    
+    def read(self, size=-1):
+        return self._file.read(size) if not self._file.closed else b''
+    
+    def readline(self, size=-1):
+        return self._file.readline(size) if not self._file.closed else b''
+    
+    def _write(self, data):
+        if data:
+            self._sha.update(data)
+            self._file.write(data)
+    
+    def discard(self, error):
+        self.error = str(error)
+        self.close()
+    
+    def save(self, destination):
+        if self.error is not None:
+            raise ValueError(self.error)
+        self._file.close()
+        os.replace(self.path, destination)
+        self.saved = True
+        return self._sha.hexdigest()
+    
+    def close(self):
+        self._file.close()
+        if not self.saved:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if filename and allowed_file(filename):
+            return UploadStream(app.config['UPLOAD_FOLDER'], get_file_extension(filename))
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+app.request_class = UploadRequest
+
+def save_upload(file, upload_path):
+    if isinstance(file.stream, UploadStream):
+        digest = file.stream.save(upload_path)
+        parse_cache.remember_digest(upload_path, digest)
+    else:
+        file.save(upload_path)
+
+def run_conversion(upload_path, file_extension, format_type, output_path, options=None):
+    converter = converters[format_type]
+    cache_key = output_cache.key(parse_cache.key(upload_path, file_extension), format_type, options, converter.VERSION)
+    if output_cache.fetch(cache_key, output_path):
+        track_output(output_path, cache_key)
+        return True
+    
+    convert_task(upload_path, file_extension, format_type, output_path, options)
+    output_cache.store(cache_key, output_path)
+    track_output(output_path, cache_key)
+    return False
+
+class ZipStreamBuffer(io.RawIOBase):
+    def __init__(self):
+        self._chunks = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def file_crc32(src):
+    crc = 0
+    for chunk in iter(lambda: src.read(ZIP_CHUNK_SIZE), b''):
+        crc = zlib.crc32(chunk, crc)
+    src.seek(0)
+    return crc
+
+def stream_zip(entries):
+    buffer = ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for file_path, arcname in entries:
+            try:
+                src = open(file_path, 'rb')
+            except OSError:
+                continue
+            with src:
+                zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                if get_file_extension(arcname) in PRECOMPRESSED_EXTENSIONS:
+                    # zipfile only writes sizes and CRC after the data on an unseekable
+                    # stream, so write the local header for stored entries up front
+                    zinfo.compress_type = zipfile.ZIP_STORED
+                    zinfo.file_size = zinfo.compress_size = os.fstat(src.fileno()).st_size
+                    zinfo.CRC = file_crc32(src)
+                    zinfo.header_offset = zf.fp.tell()
+                    zf.fp.write(zinfo.FileHeader(zinfo.file_size > zipfile.ZIP64_LIMIT))
+                    for chunk in iter(lambda: src.read(ZIP_CHUNK_SIZE), b''):
+                        zf.fp.write(chunk)
+                        yield buffer.drain()
+                    zf.start_dir = zf.fp.tell()
+                    zf.filelist.append(zinfo)
+                    zf.NameToInfo[zinfo.filename] = zinfo
+                else:
+                    zinfo.compress_type = zipfile.ZIP_DEFLATED
+                    with zf.open(zinfo, 'w') as dest:
+                        for chunk in iter(lambda: src.read(ZIP_CHUNK_SIZE), b''):
+                            dest.write(chunk)
+                            data = buffer.drain()
+                            if data:
+                                yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    data = buffer.drain()
+    if data:
+        yield data
+
+def file_inode(stat):
+    return f"{stat.st_dev}:{stat.st_ino}"
+
+def track_file(path, kind):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+    state.track_file(path, kind, stat.st_size, inode=file_inode(stat))
+    if MAX_STORAGE_BYTES and state.storage_bytes() > MAX_STORAGE_BYTES:
+        expiry_wakeup.set()
+
+def track_output(output_path, cache_key):
+    track_file(output_path, 'output')
+    track_file(output_cache.blob_path(cache_key, output_path), 'cache')
+
+def remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            app.logger.warning('Could not remove expired file %s: %s', path, e)
+    return len(paths)
+
+def expire_files(now=None):
+    now = time.time() if now is None else now
+    removed = 0
+    while True:
+        paths = state.pop_expired_files(now, EXPIRY_BATCH_SIZE)
+        removed += remove_files(paths)
+        for path in paths:
+            upload_id = chunked_upload_id(path)
+            if upload_id:
+                state.delete('upload', upload_id)
+        if len(paths) < EXPIRY_BATCH_SIZE:
+            break
+    
+    if MAX_STORAGE_BYTES:
+        excess = state.storage_bytes() - MAX_STORAGE_BYTES
+        if excess > 0:
+            removed += remove_files(state.pop_eviction_candidates(excess))
+    
+    if removed:
+        output_cache.prune()
+    state.expire(now)
+    return removed
+
+def scan_files():
+    folders = [(app.config['UPLOAD_FOLDER'], 'upload'), (app.config['OUTPUT_FOLDER'], 'output')]
+    if parse_cache.disk_dir:
+        folders.append((parse_cache.disk_dir, 'cache'))
+    for folder, kind in folders:
+        try:
+            entries = os.scandir(folder)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
                 try:
-                    file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-                    if now - file_time > timedelta(hours=1):
-                        os.remove(filepath)
-                except:
-                    pass
+                    if not entry.is_file():
+                        continue
+                    stat = os.stat(entry.path)
+                except OSError:
+                    continue
+                if entry.name.startswith('cache_'):
+                    file_kind = 'cache'
+                elif entry.name.startswith(CHUNKED_PART_PREFIX):
+                    file_kind = 'part'
+                else:
+                    file_kind = kind
+                state.track_file(
+                    entry.path, file_kind, stat.st_size, stat.st_mtime + FILE_TTL,
+                    replace=False, inode=file_inode(stat),
+                )
 
 def cleanup_worker():
+    scanned_at = 0
     while True:
-        time.sleep(3600)
-        cleanup_old_files()
+        try:
+            if not scanned_at or (FILE_SCAN_INTERVAL and time.time() - scanned_at >= FILE_SCAN_INTERVAL):
+                scan_files()
+                scanned_at = time.time()
+            expire_files()
+        except Exception:
+            app.logger.exception('File expiry failed')
+        expiry_wakeup.wait(EXPIRY_INTERVAL)
+        expiry_wakeup.clear()
+
+state = create_state_backend()
+jobs = JobManager()
+job_state_lock = threading.Lock()
+expiry_wakeup = threading.Event()
+parse_cache.on_disk_write = lambda path: track_file(path, 'cache')
 
 cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
-cleanup_thread.start()
+if multiprocessing.current_process().name == 'MainProcess':
+    cleanup_thread.start()
+
+def save_job(job):
+    with job_state_lock:
+        state.put('job', job.id, job.to_dict())
+
+def record_history(file_id, output_filename, format_type):
+    history_entry = {
+        'id': str(uuid.uuid4()),
+        'input_file': file_id,
+        'input_filename': os.path.splitext(file_id)[0],
+        'input_format': get_file_extension(file_id),
+        'output_file': output_filename,
+        'output_format': format_type,
+        'timestamp': datetime.now().isoformat(),
+        'download_url': f'/api/download/{output_filename}'
+    }
+    state.add_history(history_entry)
+    return history_entry
 
-batch_conversions = {}
-conversion_history = []
+def prepare_batch_tasks(file_infos, format_type, options=None):
+    tasks = []
+    for file_info in file_infos:
+        try:
+            tasks.append(prepare_conversion_task(file_info, format_type, options))
+        except Exception as e:
+            tasks.append(({
+                'file_id': file_info['file_id'],
+                'original_filename': file_info.get('filename', file_info['file_id']),
+            }, e))
+    return tasks
+
+def finish_conversion(job, index, result, written=None):
+    for path in written or []:
+        track_file(path, 'cache')
+    if not result['cached']:
+        output_path = os.path.join(app.config['OUTPUT_FOLDER'], result['output_file'])
+        output_cache.store(result['_cache_key'], output_path)
+        track_output(output_path, result['_cache_key'])
+    if job.kind == 'convert':
+        record_history(result['file_id'], result['output_file'], result['output_format'])
+
+def finish_batch(batch_id, format_type, job):
+    converted = [{
+        'original_filename': r['original_filename'],
+        'output_file': r['output_file'],
+        'download_url': r['download_url'],
+    } for r in job.results if r['status'] == 'completed']
+    state.update('batch', batch_id, converted=converted, format=format_type)
+
+def finish_job(job, batch_id=None, format_type=None):
+    if batch_id is not None:
+        finish_batch(batch_id, format_type, job)
+    save_job(job)
+
+def prepare_conversion_task(file_info, format_type, options=None):
+    file_id = file_info['file_id']
+    upload_path = os.path.join(app.config['UPLOAD_FOLDER'], file_id)
+    if not os.path.exists(upload_path):
+        raise FileNotFoundError(f'File not found: {file_id}')
+    
+    file_extension = get_file_extension(file_id)
+    converter = converters[format_type]
+    base_name = os.path.splitext(file_id)[0]
+    output_filename = converter.generate_output_filename(base_name, format_type)
+    output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+    os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
+    
+    item = {
+        'file_id': file_id,
+        'original_filename': file_info.get('filename', file_id),
+        'output_file': output_filename,
+        'output_format': format_type,
+        'download_url': f'/api/download/{output_filename}',
+        '_cache_key': output_cache.key(parse_cache.key(upload_path, file_extension), format_type, options, converter.VERSION),
+    }
+    if output_cache.fetch(item['_cache_key'], output_path):
+        track_output(output_path, item['_cache_key'])
+        return dict(item, cached=True), None
+    
+    content = parse_cache.peek(upload_path, file_extension, options)
+    args = (upload_path, file_extension, format_type, output_path, options, content)
+    return dict(item, cached=False), (convert_task, args)
 
 @app.route('/')
 def index():
@@ -117,6 +428,45 @@ def get_input_formats():
     input_formats = [{'id': k, 'name': k.upper(), 'extension': k} for k in PARSERS.keys()]
     return jsonify({'formats': input_formats})
 
+def make_upload_filename(original_filename, file_extension):
+    filename = secure_filename(original_filename)
+    if not filename:
+        filename = f"upload.{file_extension}"
+    
+    unique_id = str(uuid.uuid4())[:8]
+    safe_name = os.path.splitext(filename)[0]
+    if not safe_name or safe_name.strip() == '':
+        safe_name = "upload"
+    else:
+        safe_name = "".join(c for c in safe_name if c.isalnum() or c in (' ', '-', '_', '.')).strip()
+        if not safe_name:
+            safe_name = "upload"
+    
+    return f"{safe_name}_{unique_id}.{file_extension}"
+
+def finish_upload(upload_path, upload_filename, original_filename, file_extension):
+    try:
+        summary = parse_cache.summary(upload_path, file_extension)
+    except Exception as e:
+        if os.path.exists(upload_path):
+            os.remove(upload_path)
+        return jsonify({'error': f'Failed to parse file: {str(e)}'}), 400
+    
+    if summary['character_count'] == 0:
+        os.remove(upload_path)
+        return jsonify({'error': 'File is empty or could not extract text'}), 400
+    
+    metadata = get_file_metadata(upload_path, file_extension)
+    track_file(upload_path, 'upload')
+    
+    return jsonify({
+        'success': True,
+        'file_id': upload_filename,
+        'filename': original_filename,
+        'size': summary['character_count'],
+        'metadata': metadata
+    })
+
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
     try:
@@ -139,54 +489,218 @@ def upload_file():
         if not file_extension or file_extension not in ALLOWED_EXTENSIONS:
             return jsonify({'error': f'Invalid file extension. Supported formats: {", ".join(sorted(ALLOWED_EXTENSIONS))}'}), 400
         
-        filename = secure_filename(original_filename)
-        if not filename:
-            filename = f"upload.{file_extension}"
-        
-        unique_id = str(uuid.uuid4())[:8]
-        safe_name = os.path.splitext(filename)[0]
-        if not safe_name or safe_name.strip() == '':
-            safe_name = "upload"
-        else:
-            safe_name = "".join(c for c in safe_name if c.isalnum() or c in (' ', '-', '_', '.')).strip()
-            if not safe_name:
-                safe_name = "upload"
-        
-        upload_filename = f"{safe_name}_{unique_id}.{file_extension}"
+        upload_filename = make_upload_filename(original_filename, file_extension)
         upload_path = os.path.join(app.config['UPLOAD_FOLDER'], upload_filename)
         
         os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        file.save(upload_path)
+        try:
+            save_upload(file, upload_path)
+        except ValueError as e:
+            return jsonify({'error': f'Invalid {file_extension.upper()} file: {str(e)}'}), 400
         
         if not os.path.exists(upload_path):
             return jsonify({'error': 'Failed to save file'}), 500
         
-        try:
-            parser = get_parser(file_extension)
-            content = parser.parse(upload_path)
-        except Exception as e:
-            if os.path.exists(upload_path):
-                os.remove(upload_path)
-            return jsonify({'error': f'Failed to parse file: {str(e)}'}), 400
-        
-        if len(content) == 0:
-            os.remove(upload_path)
-            return jsonify({'error': 'File is empty or could not extract text'}), 400
-        
-        metadata = get_file_metadata(upload_path, file_extension)
-        
-        return jsonify({
-            'success': True,
-            'file_id': upload_filename,
-            'filename': original_filename,
-            'size': len(content),
-            'metadata': metadata
-        })
+        return finish_upload(upload_path, upload_filename, original_filename, file_extension)
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
+def read_request_bytes(size):
+    pieces = []
+    while size > 0:
+        data = request.stream.read(min(UPLOAD_READ_SIZE, size))
+        if not data:
+            break
+        pieces.append(data)
+        size -= len(data)
+    return b''.join(pieces)
+
+def mark_chunk_received(upload, index):
+    received = upload['received']
+    upload['received'] = received[:index] + '1' + received[index + 1:]
+
+def chunked_upload_status(upload_id, upload):
+    return {
+        'upload_id': upload_id,
+        'filename': upload['filename'],
+        'size': upload['size'],
+        'chunk_size': upload['chunk_size'],
+        'chunk_count': len(upload['received']),
+        'received': upload['received'],
+        'missing': upload['received'].count('0'),
+        'file_id': upload.get('file_id')
+    }
+
+def chunked_upload_id(path):
+    name = os.path.basename(path)
+    if name.startswith(CHUNKED_PART_PREFIX) and name.endswith('.part'):
+        return name[len(CHUNKED_PART_PREFIX):-len('.part')]
+    return None
+
+def discard_chunked_upload(upload_id, upload):
+    remove_files([upload['part_path']])
+    state.forget_file(upload['part_path'])
+    state.delete('upload', upload_id)
+
+def load_chunked_upload(upload_id):
+    upload = state.get('upload', upload_id)
+    if upload is None:
+        return None, (jsonify({'error': 'Upload not found'}), 404)
+    
+    if not upload.get('file_id') and not os.path.exists(upload['part_path']):
+        discard_chunked_upload(upload_id, upload)
+        return None, (jsonify({'error': 'Upload is no longer available'}), 410)
+    
+    return upload, None
+
+@app.route('/api/uploads', methods=['POST'])
+def init_chunked_upload():
+    data = request.get_json(silent=True)
+    
+    if not data or 'filename' not in data or 'size' not in data:
+        return jsonify({'error': 'Missing filename or size'}), 400
+    
+    original_filename = data['filename']
+    if not isinstance(original_filename, str) or not allowed_file(original_filename):
+        return jsonify({'error': f'Invalid file type. Supported formats: {", ".join(sorted(ALLOWED_EXTENSIONS))}'}), 400
+    
+    try:
+        size = int(data['size'])
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Size must be a number of bytes'}), 400
+    
+    if size <= 0:
+        return jsonify({'error': 'File is empty'}), 400
+    if size > MAX_UPLOAD_BYTES:
+        return jsonify({'error': f'File is larger than the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit'}), 413
+    
+    upload_id = uuid.uuid4().hex
+    part_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{CHUNKED_PART_PREFIX}{upload_id}.part")
+    if not state.reserve_file(part_path, 'part', size, MAX_ACTIVE_UPLOADS, MAX_ACTIVE_UPLOAD_BYTES):
+        return jsonify({'error': 'Too many uploads in progress, please try again later'}), 503
+    
+    try:
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        remove_files([part_path])
+        state.forget_file(part_path)
+        return jsonify({'error': f'Could not start upload: {str(e)}'}), 507
+    
+    upload = {
+        'filename': original_filename,
+        'file_extension': get_file_extension(original_filename),
+        'size': size,
+        'chunk_size': UPLOAD_CHUNK_SIZE,
+        'part_path': part_path,
+        'received': '0' * -(-size // UPLOAD_CHUNK_SIZE),
+        'created_at': datetime.now().isoformat()
+    }
+    state.put('upload', upload_id, upload)
+    
+    return jsonify(dict(chunked_upload_status(upload_id, upload), success=True)), 201
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+def get_chunked_upload(upload_id):
+    upload, error = load_chunked_upload(upload_id)
+    if error:
+        return error
+    
+    return jsonify(dict(chunked_upload_status(upload_id, upload), success=True))
+
+@app.route('/api/uploads/<upload_id>/chunks/<int:index>', methods=['PUT'])
+def upload_chunk(upload_id, index):
+    upload, error = load_chunked_upload(upload_id)
+    if error:
+        return error
+    
+    if upload.get('file_id'):
+        return jsonify({'error': 'Upload already completed'}), 409
+    
+    if index >= len(upload['received']):
+        return jsonify({'error': f'Chunk index out of range: {index}'}), 400
+    
+    offset = index * upload['chunk_size']
+    expected = min(upload['chunk_size'], upload['size'] - offset)
+    if request.content_length != expected:
+        return jsonify({'error': f'Chunk {index} must be exactly {expected} bytes'}), 400
+    
+    try:
+        fd = os.open(upload['part_path'], os.O_WRONLY)
+    except FileNotFoundError:
+        discard_chunked_upload(upload_id, upload)
+        return jsonify({'error': 'Upload is no longer available'}), 410
+    
+    try:
+        written = 0
+        if index == 0:
+            head = read_request_bytes(min(SNIFF_BYTES, expected))
+            try:
+                sniff_content(head, upload['file_extension'])
+            except ValueError as e:
+                discard_chunked_upload(upload_id, upload)
+                return jsonify({'error': f'Invalid {upload["file_extension"].upper()} file: {str(e)}'}), 400
+            written = os.pwrite(fd, head, offset)
+        
+        while written < expected:
+            data = request.stream.read(min(UPLOAD_READ_SIZE, expected - written))
+            if not data:
+                break
+            written += os.pwrite(fd, data, offset + written)
+    finally:
+        os.close(fd)
+    
+    if written != expected:
+        return jsonify({'error': f'Chunk {index} was incomplete ({written} of {expected} bytes)'}), 400
+    
+    upload = state.modify('upload', upload_id, lambda data: mark_chunk_received(data, index), refresh=True)
+    if upload is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    state.track_file(upload['part_path'], 'part', upload['size'])
+    
+    return jsonify(dict(chunked_upload_status(upload_id, upload), success=True))
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+def complete_chunked_upload(upload_id):
+    upload, error = load_chunked_upload(upload_id)
+    if error:
+        return error
+    
+    missing = upload['received'].count('0')
+    if missing and not upload.get('file_id'):
+        return jsonify(dict(chunked_upload_status(upload_id, upload), error=f'{missing} chunks are still missing')), 409
+    
+    upload_filename = make_upload_filename(upload['filename'], upload['file_extension'])
+    upload = state.modify('upload', upload_id, lambda data: data.setdefault('file_id', upload_filename))
+    if upload is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    
+    upload_path = os.path.join(app.config['UPLOAD_FOLDER'], upload['file_id'])
+    if upload['file_id'] == upload_filename:
+        try:
+            os.replace(upload['part_path'], upload_path)
+        except FileNotFoundError:
+            discard_chunked_upload(upload_id, upload)
+            return jsonify({'error': 'Upload is no longer available'}), 410
+        state.forget_file(upload['part_path'])
+    elif not os.path.exists(upload_path):
+        return jsonify({'error': 'Upload is still being completed'}), 409
+    
+    try:
+        response = finish_upload(upload_path, upload['file_id'], upload['filename'], upload['file_extension'])
+    except Exception as e:
+        remove_files([upload_path])
+        response = jsonify({'error': f'Upload failed: {str(e)}'}), 500
+    if isinstance(response, tuple):
+        state.delete('upload', upload_id)
+    return response
+
 @app.route('/api/convert', methods=['POST'])
 def convert_file():
     data = request.get_json()
@@ -196,10 +710,14 @@ def convert_file():
     
     file_id = data['file_id']
     format_type = data['format'].lower()
+    options = data.get('options')
     
     if format_type not in converters:
         return jsonify({'error': f'Unsupported format: {format_type}'}), 400
     
+    if options is not None and not isinstance(options, dict):
+        return jsonify({'error': 'Options must be an object'}), 400
+    
     upload_path = os.path.join(app.config['UPLOAD_FOLDER'], file_id)
     
     if not os.path.exists(upload_path):
@@ -207,8 +725,6 @@ def convert_file():
     
     try:
         file_extension = get_file_extension(file_id)
-        parser = get_parser(file_extension)
-        content = parser.parse(upload_path)
         
         converter = converters[format_type]
         base_name = os.path.splitext(file_id)[0]
@@ -217,34 +733,76 @@ def convert_file():
         
         os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
         
-        converter.convert(content, output_path)
+        cached = run_conversion(upload_path, file_extension, format_type, output_path, options)
         
-        history_entry = {
-            'id': str(uuid.uuid4()),
-            'input_file': file_id,
-            'input_filename': os.path.splitext(file_id)[0],
-            'input_format': file_extension,
-            'output_file': output_filename,
-            'output_format': format_type,
-            'timestamp': datetime.now().isoformat(),
-            'download_url': f'/api/download/{output_filename}'
-        }
-        conversion_history.append(history_entry)
-        
-        if len(conversion_history) > 100:
-            conversion_history.pop(0)
+        history_entry = record_history(file_id, output_filename, format_type)
         
         return jsonify({
             'success': True,
             'output_file': output_filename,
             'download_url': f'/api/download/{output_filename}',
-            'history_id': history_entry['id']
+            'history_id': history_entry['id'],
+            'cached': cached
         })
     except ValueError as e:
         return jsonify({'error': f'Validation error: {str(e)}'}), 400
     except Exception as e:
         return jsonify({'error': f'Conversion failed: {str(e)}'}), 500
 
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    data = request.get_json()
+    
+    if not data or 'format' not in data or ('file_id' not in data and 'batch_id' not in data):
+        return jsonify({'error': 'Missing file_id/batch_id or format'}), 400
+    
+    format_type = data['format'].lower()
+    options = data.get('options')
+    
+    if format_type not in converters:
+        return jsonify({'error': f'Unsupported format: {format_type}'}), 400
+    
+    if options is not None and not isinstance(options, dict):
+        return jsonify({'error': 'Options must be an object'}), 400
+    
+    if 'batch_id' in data:
+        batch_id = data['batch_id']
+        batch = state.get('batch', batch_id)
+        if batch is None:
+            return jsonify({'error': 'Batch not found'}), 404
+        kind = 'batch'
+        file_infos = batch['files']
+    else:
+        batch_id = None
+        kind = 'convert'
+        file_infos = [{'file_id': data['file_id']}]
+        if not os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], data['file_id'])):
+            return jsonify({'error': 'File not found'}), 404
+    
+    tasks = prepare_batch_tasks(file_infos, format_type, options)
+    job = jobs.submit(
+        kind, tasks,
+        on_result=finish_conversion,
+        on_complete=lambda job: finish_job(job, batch_id, format_type),
+    )
+    save_job(job)
+    
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f'/api/jobs/{job.id}'
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = jobs.get(job_id)
+    data = job.to_dict() if job is not None else state.get('job', job_id)
+    if data is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify({'success': True, 'job': data})
+
 @app.route('/api/file-info/<file_id>', methods=['GET'])
 def get_file_info(file_id):
     file_id = secure_filename(file_id)
@@ -261,16 +819,42 @@ def get_file_info(file_id):
     
     return jsonify({'metadata': metadata})
 
+def parse_history_time(value):
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
 @app.route('/api/history', methods=['GET'])
 def get_history():
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+        cursor = request.args.get('cursor')
+        cursor = int(cursor) if cursor else None
+        since = parse_history_time(request.args.get('since'))
+        until = parse_history_time(request.args.get('until'))
+    except ValueError as e:
+        return jsonify({'error': f'Invalid history query: {str(e)}'}), 400
+    
+    history, next_cursor = state.list_history(
+        limit, cursor,
+        input_format=request.args.get('input_format'),
+        output_format=request.args.get('output_format'),
+        since=since,
+        until=until,
+    )
     return jsonify({
         'success': True,
-        'history': conversion_history[-50:]
+        'history': history,
+        'next_cursor': next_cursor,
+        'counts': state.history_counts()
     })
 
 @app.route('/api/history/clear', methods=['POST'])
 def clear_history():
-    conversion_history.clear()
+    state.clear_history()
     return jsonify({'success': True, 'message': 'History cleared'})
 
 @app.route('/api/batch-upload', methods=['POST'])
@@ -302,18 +886,18 @@ def batch_upload():
             upload_path = os.path.join(app.config['UPLOAD_FOLDER'], upload_filename)
             
             os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-            file.save(upload_path)
+            save_upload(file, upload_path)
+            track_file(upload_path, 'upload')
             
             if os.path.exists(upload_path):
-                parser = get_parser(file_extension)
-                content = parser.parse(upload_path)
+                summary = parse_cache.summary(upload_path, file_extension)
                 
-                if len(content) > 0:
+                if summary['character_count'] > 0:
                     metadata = get_file_metadata(upload_path, file_extension)
                     uploaded_files.append({
                         'file_id': upload_filename,
                         'filename': filename,
-                        'size': len(content),
+                        'size': summary['character_count'],
                         'metadata': metadata
                     })
         except Exception as e:
@@ -322,10 +906,10 @@ def batch_upload():
     if not uploaded_files:
         return jsonify({'error': 'No valid files uploaded'}), 400
     
-    batch_conversions[batch_id] = {
+    state.put('batch', batch_id, {
         'files': uploaded_files,
         'created_at': datetime.now().isoformat()
-    }
+    })
     
     return jsonify({
         'success': True,
@@ -343,76 +927,62 @@ def batch_convert():
     
     batch_id = data['batch_id']
     format_type = data['format'].lower()
+    options = data.get('options')
     
-    if batch_id not in batch_conversions:
+    batch = state.get('batch', batch_id)
+    if batch is None:
         return jsonify({'error': 'Batch not found'}), 404
     
     if format_type not in converters:
         return jsonify({'error': f'Unsupported format: {format_type}'}), 400
     
-    batch = batch_conversions[batch_id]
-    converted_files = []
+    if options is not None and not isinstance(options, dict):
+        return jsonify({'error': 'Options must be an object'}), 400
     
-    for file_info in batch['files']:
-        try:
-            file_id = file_info['file_id']
-            upload_path = os.path.join(app.config['UPLOAD_FOLDER'], file_id)
-            
-            if not os.path.exists(upload_path):
-                continue
-            
-            file_extension = get_file_extension(file_id)
-            parser = get_parser(file_extension)
-            content = parser.parse(upload_path)
-            
-            converter = converters[format_type]
-            base_name = os.path.splitext(file_id)[0]
-            output_filename = converter.generate_output_filename(base_name, format_type)
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-            
-            os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
-            converter.convert(content, output_path)
-            
-            converted_files.append({
-                'original_filename': file_info['filename'],
-                'output_file': output_filename,
-                'download_url': f'/api/download/{output_filename}'
-            })
-        except Exception as e:
-            continue
+    tasks = prepare_batch_tasks(batch['files'], format_type, options)
+    job = jobs.submit(
+        'batch', tasks,
+        on_result=finish_conversion,
+        on_complete=lambda job: finish_job(job, batch_id, format_type),
+        max_concurrency=app.config['BATCH_CONCURRENCY'],
+    )
+    job.wait()
     
-    batch_conversions[batch_id]['converted'] = converted_files
-    batch_conversions[batch_id]['format'] = format_type
+    results = job.to_dict()['files']
+    converted_files = [{
+        'original_filename': r['original_filename'],
+        'output_file': r['output_file'],
+        'download_url': r['download_url'],
+    } for r in results if r['status'] == 'completed']
     
     return jsonify({
         'success': True,
         'batch_id': batch_id,
         'converted_files': converted_files,
-        'count': len(converted_files)
+        'files': results,
+        'count': len(converted_files),
+        'failed': len(results) - len(converted_files)
     })
 
 @app.route('/api/batch-download/<batch_id>', methods=['GET'])
 def batch_download(batch_id):
-    if batch_id not in batch_conversions:
+    batch = state.get('batch', batch_id)
+    if batch is None:
         return jsonify({'error': 'Batch not found'}), 404
     
-    batch = batch_conversions[batch_id]
     if 'converted' not in batch:
         return jsonify({'error': 'Batch not converted yet'}), 400
     
-    memory_file = io.BytesIO()
-    with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for file_info in batch['converted']:
-            file_path = os.path.join(app.config['OUTPUT_FOLDER'], file_info['output_file'])
-            if os.path.exists(file_path):
-                zf.write(file_path, file_info['output_file'])
-    
-    memory_file.seek(0)
-    return send_file(
-        memory_file,
+    entries = [
+        (os.path.join(app.config['OUTPUT_FOLDER'], file_info['output_file']), file_info['output_file'])
+        for file_info in batch['converted']
+    ]
+    for file_path, _ in entries:
+        state.touch_file(file_path)
+    return Response(
+        stream_zip(entries),
         mimetype='application/zip',
-        as_attachment=True,
-        download_name=f'converted_files_{batch_id[:8]}.zip'
+        headers={'Content-Disposition': f'attachment; filename=converted_files_{batch_id[:8]}.zip'}
     )
 
 @app.route('/api/download/<filename>', methods=['GET'])
@@ -426,6 +996,7 @@ def download_file(filename):
     if '..' in filename or filename.startswith('/'):
         return jsonify({'error': 'Invalid filename'}), 400
     
+    state.touch_file(file_path)
     return send_file(file_path, as_attachment=True)
 
 if __name__ == '__main__':
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from converters import DOCXConverter
+from converters.parsers import DOCXParser
+
+def build_text(line_count):
+    return "\n".join(
+        "" if i % 10 == 9 else f"Line {i}: the quick brown fox jumps over the lazy dog\twith a tab"
+        for i in range(line_count)
+    )
+
+def time_convert(converter, text, output_path, options=None):
+    start = time.perf_counter()
+    converter.convert(text, output_path, options)
+    return time.perf_counter() - start
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+    converter = DOCXConverter()
+    
+    print(f"{'lines':>8} {'python-docx':>12} {'fast':>8} {'speedup':>8} {'round-trip':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for line_count in sizes:
+            text = build_text(line_count)
+            slow_path = os.path.join(tmp, 'slow.docx')
+            fast_path = os.path.join(tmp, 'fast.docx')
+            
+            slow = time_convert(converter, text, slow_path)
+            fast = time_convert(converter, text, fast_path, {'mode': 'fast'})
+            same = DOCXParser.parse(slow_path) == DOCXParser.parse(fast_path)
+            
+            print(f"{line_count:>8} {slow:>11.2f}s {fast:>7.2f}s {slow / fast:>7.1f}x {str(same):>10}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+heavy = [name for name in ('reportlab', 'docx', 'ebooklib', 'odf', 'PyPDF2', 'lxml') if name in sys.modules]
+print(json.dumps({'seconds': elapsed, 'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 'heavy': heavy}))
+"""
+
+def probe(preload):
+    env = dict(os.environ, CONVERTER_PRELOAD='1' if preload else '0')
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    
+    print(f"{'mode':>8} {'import':>9} {'rss':>8}  heavy modules loaded")
+    for preload in (True, False):
+        results = [probe(preload) for _ in range(runs)]
+        seconds = statistics.median(result['seconds'] for result in results)
+        rss_mb = statistics.median(result['rss_kb'] for result in results) / 1024
+        mode = 'preload' if preload else 'lazy'
+        print(f"{mode:>8} {seconds:>8.3f}s {rss_mb:>6.1f}MB  {', '.join(results[-1]['heavy']) or '-'}")
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,94 @@
+import os
+import threading
+from importlib import import_module
+
 from .base import BaseConverter
-from .pdf_converter import PDFConverter
-from .docx_converter import DOCXConverter
-from .html_converter import HTMLConverter
-from .json_converter import JSONConverter
-from .csv_converter import CSVConverter
-from .xml_converter import XMLConverter
-from .rtf_converter import RTFConverter
-from .epub_converter import EPUBConverter
-from .odt_converter import ODTConverter
+
+CONVERTER_SPECS = {
+    'pdf': 'pdf_converter:PDFConverter',
+    'docx': 'docx_converter:DOCXConverter',
+    'html': 'html_converter:HTMLConverter',
+    'json': 'json_converter:JSONConverter',
+    'csv': 'csv_converter:CSVConverter',
+    'xml': 'xml_converter:XMLConverter',
+    'rtf': 'rtf_converter:RTFConverter',
+    'epub': 'epub_converter:EPUBConverter',
+    'odt': 'odt_converter:ODTConverter',
+}
+
+CLASS_SPECS = {spec.split(':')[1]: spec for spec in CONVERTER_SPECS.values()}
+
+def load_class(spec):
+    module_name, class_name = spec.split(':')
+    return getattr(import_module(f'.{module_name}', __name__), class_name)
+
+class ConverterRegistry:
+    def __init__(self, specs):
+        self.specs = dict(specs)
+        self._instances = {}
+        self._lock = threading.Lock()
+    
+    def register(self, format_type, spec):
+        with self._lock:
+            self.specs[format_type] = spec
+            self._instances.pop(format_type, None)
+    
+    def __getitem__(self, format_type):
+        converter = self._instances.get(format_type)
+        if converter is not None:
+            return converter
+        spec = self.specs[format_type]
+        with self._lock:
+            if format_type not in self._instances:
+                self._instances[format_type] = load_class(spec)()
+            return self._instances[format_type]
+    
+    def get(self, format_type, default=None):
+        return self[format_type] if format_type in self.specs else default
+    
+    def __contains__(self, format_type):
+        return format_type in self.specs
+    
+    def __iter__(self):
+        return iter(self.specs)
+    
+    def __len__(self):
+        return len(self.specs)
+    
+    def keys(self):
+        return self.specs.keys()
+    
+    def loaded(self):
+        return list(self._instances)
+    
+    def preload(self):
+        for format_type in self.specs:
+            self[format_type].warm()
+
+CONVERTERS = ConverterRegistry(CONVERTER_SPECS)
+
+def get_converter(format_type):
+    if format_type not in CONVERTERS:
+        raise ValueError(f"Unsupported output format: {format_type}")
+    return CONVERTERS[format_type]
+
+def preload():
+    from . import parsers
+    CONVERTERS.preload()
+    parsers.preload()
+
+def __getattr__(name):
+    if name in CLASS_SPECS:
+        return load_class(CLASS_SPECS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if os.environ.get('CONVERTER_PRELOAD', '').lower() in ('1', 'true', 'yes'):
+    preload()
 
 __all__ = [
+    'CONVERTERS',
+    'get_converter',
+    'preload',
     'BaseConverter',
     'PDFConverter',
     'DOCXConverter',
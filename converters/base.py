@@ -1,20 +1,78 @@
 from abc import ABC, abstractmethod
+from itertools import chain
 import os
 import uuid
+import threading
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+XML_TEXT_TABLE = {ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;'}
+XML_TEXT_TABLE.update({code: None for code in range(0x20) if code not in (0x09, 0x0A, 0x0D)})
+XML_TEXT_TABLE.update({0xFFFE: None, 0xFFFF: None})
+
+def escape_xml_text(text):
+    return text.translate(XML_TEXT_TABLE)
+
+def iter_lines(blocks):
+    pending = []
+    for block in blocks:
+        if not block:
+            continue
+        parts = block.split('\n')
+        if len(parts) == 1:
+            pending.append(block)
+            continue
+        pending.append(parts[0])
+        yield ''.join(pending)
+        yield from parts[1:-1]
+        pending = [parts[-1]]
+    yield ''.join(pending)
 
 class BaseConverter(ABC):
+    VERSION = 1
+    STREAMING = False
+    
+    _resources_lock = threading.RLock()
+    
     def __init__(self):
         self.supported_extensions = []
     
+    @classmethod
+    def resource(cls, name, factory):
+        resources = cls.__dict__.get('_resources')
+        if resources is not None and name in resources:
+            return resources[name]
+        with BaseConverter._resources_lock:
+            if '_resources' not in cls.__dict__:
+                cls._resources = {}
+            if name not in cls._resources:
+                cls._resources[name] = factory()
+            return cls._resources[name]
+    
+    def warm(self):
+        pass
+    
     @abstractmethod
     def convert(self, input_text, output_path, options=None):
         pass
     
+    def convert_stream(self, blocks, output_path, options=None):
+        return self.convert(''.join(blocks), output_path, options)
+    
     def validate_input(self, input_text):
         if not input_text or not isinstance(input_text, str):
             raise ValueError("Input text must be a non-empty string")
         return True
     
+    def validate_blocks(self, blocks):
+        blocks = iter(blocks)
+        for block in blocks:
+            if not isinstance(block, str):
+                break
+            if block:
+                return chain([block], blocks)
+        raise ValueError("Input text must be a non-empty string")
+    
     def ensure_output_dir(self, output_path):
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir):
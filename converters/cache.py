@@ -0,0 +1,299 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+
+from .parsers import get_parser, ParseResult
+
+HASH_CHUNK_SIZE = 1024 * 1024
+MAX_TRACKED_DIGESTS = 4096
+MAX_SUMMARIES = 4096
+
+def file_digest(file_path):
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+class ParseCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, stream_threshold=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.stream_threshold = stream_threshold
+        self._entries = OrderedDict()
+        self._summaries = OrderedDict()
+        self._size = 0
+        self._digests = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.on_disk_write = None
+
+    def digest(self, file_path):
+        stat = os.stat(file_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._digests.get(file_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        digest = file_digest(file_path)
+        self.remember_digest(file_path, digest, signature)
+        return digest
+
+    def remember_digest(self, file_path, digest, signature=None):
+        if signature is None:
+            stat = os.stat(file_path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            self._digests[file_path] = (signature, digest)
+            self._digests.move_to_end(file_path)
+            while len(self._digests) > MAX_TRACKED_DIGESTS:
+                self._digests.popitem(last=False)
+
+    @staticmethod
+    def parser_options(parser, options):
+        if not options:
+            return None
+        selected = {name: options[name] for name in parser.OPTIONS if options.get(name) is not None}
+        return selected or None
+
+    def key(self, file_path, file_extension, options=None):
+        extension = file_extension.lower().lstrip('.')
+        parser = get_parser(extension)
+        key = f"{self.digest(file_path)}-{extension}-v{parser.VERSION}"
+        options = self.parser_options(parser, options)
+        if options:
+            payload = json.dumps(options, sort_keys=True, default=str).encode('utf-8')
+            key += '-' + hashlib.sha256(payload).hexdigest()[:16]
+        return key
+
+    def parse(self, file_path, file_extension, options=None):
+        return self.parse_result(file_path, file_extension, options).text
+
+    def parse_result(self, file_path, file_extension, options=None):
+        parser = get_parser(file_extension)
+        key = self.key(file_path, file_extension, options)
+        options = self.parser_options(parser, options)
+
+        while True:
+            result = self._get(key)
+            if result is not None:
+                return result
+
+            with self._lock:
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+
+            if not owner:
+                event.wait()
+                continue
+
+            try:
+                result = parser.parse_result(file_path, options)
+                self._put(key, result)
+                return result
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+                event.set()
+
+    def should_stream(self, file_path, file_extension):
+        parser = get_parser(file_extension)
+        return parser.STREAMING and os.path.getsize(file_path) >= self.stream_threshold
+
+    def summary(self, file_path, file_extension):
+        if not self.should_stream(file_path, file_extension):
+            result = self.parse_result(file_path, file_extension)
+            return dict(result.stats, character_count=len(result.text), line_count=result.text.count('\n') + 1)
+
+        key = self.key(file_path, file_extension)
+        with self._lock:
+            if key in self._summaries:
+                return dict(self._summaries[key])
+
+        stats = {}
+        character_count = 0
+        newline_count = 0
+        for block in get_parser(file_extension).iter_blocks(file_path, stats):
+            character_count += len(block)
+            newline_count += block.count('\n')
+        summary = dict(stats, character_count=character_count, line_count=newline_count + 1)
+
+        with self._lock:
+            self._summaries[key] = summary
+            while len(self._summaries) > MAX_SUMMARIES:
+                self._summaries.popitem(last=False)
+        return dict(summary)
+
+    def peek(self, file_path, file_extension, options=None):
+        result = self._get(self.key(file_path, file_extension, options))
+        return result.text if result is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        result = self._read_disk(key)
+        if result is not None:
+            self._remember(key, result)
+        return result
+
+    def _put(self, key, result):
+        self._remember(key, result)
+        self._write_disk(key, result)
+
+    def _remember(self, key, result):
+        size = len(result.text)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key).text)
+            self._entries[key] = result
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.text)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return ParseResult(data['text'], data['stats'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key, result):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'text': result.text, 'stats': result.stats}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        if self.on_disk_write is not None:
+            self.on_disk_write(path)
+
+class OutputCache:
+    def __init__(self, max_bytes=256 * 1024 * 1024, ttl=3600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(input_digest, format_type, options=None, version=1):
+        payload = json.dumps([input_digest, format_type, options or {}, version], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def blob_path(key, output_path):
+        extension = os.path.splitext(output_path)[1]
+        return os.path.join(os.path.dirname(output_path), f"cache_{key[:32]}{extension}")
+
+    def fetch(self, key, output_path):
+        blob = self.blob_path(key, output_path)
+        try:
+            stat = os.stat(blob)
+        except OSError:
+            self._forget(key)
+            return False
+        if time.time() - stat.st_mtime > self.ttl:
+            self._forget(key)
+            return False
+
+        try:
+            _link_or_copy(blob, output_path)
+            os.utime(blob)
+        except OSError:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            self._forget(key)
+            return False
+        self._remember(key, blob, stat.st_size)
+        return True
+
+    def store(self, key, output_path):
+        blob = self.blob_path(key, output_path)
+        tmp_path = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            _link_or_copy(output_path, tmp_path)
+            os.replace(tmp_path, blob)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._remember(key, blob, os.path.getsize(blob))
+
+    def prune(self):
+        with self._lock:
+            missing = [key for key, (blob, _) in self._entries.items() if not os.path.exists(blob)]
+            for key in missing:
+                _, size = self._entries.pop(key)
+                self._size -= size
+
+    def _forget(self, key):
+        with self._lock:
+            if key in self._entries:
+                _, size = self._entries.pop(key)
+                self._size -= size
+
+    def _remember(self, key, blob, size):
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (blob, size)
+            self._size += size
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, (old_blob, old_size) = self._entries.popitem(last=False)
+                self._size -= old_size
+                evicted.append(old_blob)
+        for old_blob in evicted:
+            try:
+                os.remove(old_blob)
+            except OSError:
+                pass
+
+def _link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+parse_cache = ParseCache(
+    max_bytes=int(os.environ.get('PARSE_CACHE_BYTES', 64 * 1024 * 1024)),
+    disk_dir=os.environ.get('PARSE_CACHE_DIR') or None,
+    stream_threshold=int(os.environ.get('STREAM_THRESHOLD', 8 * 1024 * 1024)),
+)
+
+output_cache = OutputCache(
+    max_bytes=int(os.environ.get('OUTPUT_CACHE_BYTES', 256 * 1024 * 1024)),
+)
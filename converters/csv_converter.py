@@ -1,21 +1,24 @@
-from .base import BaseConverter
+from .base import BaseConverter, iter_lines, WRITE_BUFFER_SIZE
 import csv
 
 class CSVConverter(BaseConverter):
+    STREAMING = True
+    
     def __init__(self):
         super().__init__()
         self.supported_extensions = ['csv']
     
     def convert(self, input_text, output_path, options=None):
         self.validate_input(input_text)
+        return self.convert_stream([input_text], output_path, options)
+    
+    def convert_stream(self, blocks, output_path, options=None):
+        blocks = self.validate_blocks(blocks)
         self.ensure_output_dir(output_path)
         
-        lines = input_text.split('\n')
-        
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow(['Line Number', 'Content'])
-            for idx, line in enumerate(lines, start=1):
-                writer.writerow([idx, line])
+            writer.writerows(enumerate(iter_lines(blocks), start=1))
         
         return output_path
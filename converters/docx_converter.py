@@ -1,26 +1,115 @@
-from .base import BaseConverter
+from .base import BaseConverter, iter_lines, escape_xml_text
 from docx import Document
 from docx.shared import Pt
+import io
+import copy
+import os
+import zipfile
+import docx
+
+DOCX_TEMPLATE_PATH = os.path.join(os.path.dirname(docx.__file__), 'templates', 'default.docx')
+FAST_STYLE_ID = 'ConvertedText'
+FAST_STYLE = (
+    f'<w:style w:type="paragraph" w:customStyle="1" w:styleId="{FAST_STYLE_ID}">'
+    '<w:name w:val="Converted Text"/><w:basedOn w:val="Normal"/><w:qFormat/>'
+    '<w:pPr><w:spacing w:after="120"/></w:pPr></w:style>'
+)
+FAST_PARAGRAPH_OPEN = f'<w:p><w:pPr><w:pStyle w:val="{FAST_STYLE_ID}"/></w:pPr><w:r><w:t xml:space="preserve">'
+FAST_PARAGRAPH_CLOSE = '</w:t></w:r></w:p>'
+FAST_TAB = '</w:t><w:tab/><w:t xml:space="preserve">'
+FAST_EMPTY_PARAGRAPH = '<w:p/>'
+PARAGRAPH_SPACE_AFTER = Pt(6)
 
 class DOCXConverter(BaseConverter):
+    STREAMING = True
+    
     def __init__(self):
         super().__init__()
         self.supported_extensions = ['docx']
     
+    def warm(self):
+        self.resource('document', Document)
+        self.load_template()
+    
     def convert(self, input_text, output_path, options=None):
         self.validate_input(input_text)
+        
+        if self.use_fast_writer(options):
+            return self.convert_stream([input_text], output_path, options)
+        
         self.ensure_output_dir(output_path)
         
-        doc = Document()
+        doc = copy.deepcopy(self.resource('document', Document))
         
         lines = input_text.split('\n')
         for line in lines:
             if line.strip():
                 para = doc.add_paragraph(line)
                 para_format = para.paragraph_format
-                para_format.space_after = Pt(6)
+                para_format.space_after = PARAGRAPH_SPACE_AFTER
             else:
                 doc.add_paragraph()
         
         doc.save(output_path)
         return output_path
+    
+    def convert_stream(self, blocks, output_path, options=None):
+        blocks = self.validate_blocks(blocks)
+        if not self.use_fast_writer(options):
+            return self.convert(''.join(blocks), output_path, options)
+        
+        self.ensure_output_dir(output_path)
+        self.write_package(iter_lines(blocks), output_path)
+        return output_path
+    
+    @staticmethod
+    def use_fast_writer(options):
+        return bool(options) and options.get('mode') == 'fast'
+    
+    @classmethod
+    def load_template(cls):
+        return cls.resource('template', cls.build_template)
+    
+    @staticmethod
+    def build_template():
+        parts = []
+        with zipfile.ZipFile(DOCX_TEMPLATE_PATH) as template:
+            for info in template.infolist():
+                data = template.read(info.filename)
+                if info.filename in ('word/styles.xml', 'word/stylesWithEffects.xml'):
+                    data = data.replace(b'</w:styles>', FAST_STYLE.encode('utf-8') + b'</w:styles>')
+                parts.append((info.filename, data))
+        
+        document = dict(parts)['word/document.xml'].decode('utf-8')
+        body_start = document.index('<w:body>') + len('<w:body>')
+        section_start = document.index('<w:sectPr', body_start)
+        return {
+            'parts': [(name, data) for name, data in parts if name != 'word/document.xml'],
+            'document_head': document[:body_start],
+            'document_tail': document[section_start:],
+        }
+    
+    @classmethod
+    def write_package(cls, lines, output_path):
+        template = cls.load_template()
+        
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for name, data in template['parts']:
+                if name == 'word/_rels/document.xml.rels':
+                    cls.write_document(zf, template, lines)
+                zf.writestr(name, data)
+        
+        return output_path
+    
+    @staticmethod
+    def write_document(zf, template, lines):
+        with io.TextIOWrapper(zf.open('word/document.xml', 'w'), encoding='utf-8') as f:
+            f.write(template['document_head'])
+            for line in lines:
+                if line.strip():
+                    f.write(FAST_PARAGRAPH_OPEN)
+                    f.write(escape_xml_text(line).replace('\t', FAST_TAB))
+                    f.write(FAST_PARAGRAPH_CLOSE)
+                else:
+                    f.write(FAST_EMPTY_PARAGRAPH)
+            f.write(template['document_tail'])
@@ -1,32 +1,63 @@
-from .base import BaseConverter
+from .base import BaseConverter, iter_lines
 from ebooklib import epub
 import html
+import os
+
+CHAPTER_SIZE = int(os.environ.get('EPUB_CHAPTER_SIZE', 100 * 1024))
+
+def iter_chapters(lines, chapter_size):
+    chapter = []
+    size = 0
+    for line in lines:
+        line = html.escape(line)
+        if chapter and size + len(line) > chapter_size:
+            yield chapter
+            chapter = []
+            size = 0
+        chapter.append('<p>' + line + '</p>' if line.strip() else '<br/>')
+        size += len(line) + 1
+    yield chapter
 
 class EPUBConverter(BaseConverter):
+    VERSION = 2
+    STREAMING = True
+    
     def __init__(self):
         super().__init__()
         self.supported_extensions = ['epub']
     
     def convert(self, input_text, output_path, options=None):
         self.validate_input(input_text)
+        return self.convert_stream([input_text], output_path, options)
+    
+    def convert_stream(self, blocks, output_path, options=None):
+        blocks = self.validate_blocks(blocks)
         self.ensure_output_dir(output_path)
         
+        chapter_size = int((options or {}).get('chapter_size') or CHAPTER_SIZE)
+        if chapter_size < 1:
+            raise ValueError("chapter_size must be a positive number of characters")
+        
         book = epub.EpubBook()
         book.set_identifier('converted_text')
         book.set_title('Converted Document')
         book.set_language('en')
         book.add_author('Text Converter')
         
-        escaped_text = html.escape(input_text)
-        lines = escaped_text.split('\n')
-        html_lines = ['<p>' + line + '</p>' if line.strip() else '<br/>' for line in lines]
+        chapters = []
+        for html_lines in iter_chapters(iter_lines(blocks), chapter_size):
+            number = len(chapters) + 1
+            chapter = epub.EpubHtml(title=f'Chapter {number}', file_name=f'chapter_{number:04d}.xhtml', lang='en')
+            chapter.content = ''.join(html_lines)
+            book.add_item(chapter)
+            chapters.append(chapter)
         
-        chapter = epub.EpubHtml(title='Content', file_name='content.xhtml', lang='en')
-        chapter.content = ''.join(html_lines)
+        if len(chapters) == 1:
+            chapters[0].title = 'Content'
+            chapters[0].file_name = 'content.xhtml'
         
-        book.add_item(chapter)
-        book.toc = [chapter]
-        book.spine = ['nav', chapter]
+        book.toc = chapters
+        book.spine = ['nav'] + chapters
         
         book.add_item(epub.EpubNcx())
         book.add_item(epub.EpubNav())
@@ -1,25 +1,52 @@
-from .base import BaseConverter
+from .base import BaseConverter, iter_lines
 import json
+import tempfile
 
 class JSONConverter(BaseConverter):
+    STREAMING = True
+    
     def __init__(self):
         super().__init__()
         self.supported_extensions = ['json']
     
     def convert(self, input_text, output_path, options=None):
         self.validate_input(input_text)
+        return self.convert_stream([input_text], output_path, options)
+    
+    def convert_stream(self, blocks, output_path, options=None):
+        blocks = self.validate_blocks(blocks)
         self.ensure_output_dir(output_path)
         
-        lines = [line for line in input_text.split('\n') if line.strip()]
+        character_count = 0
+        line_count = 0
         
-        data = {
-            'content': input_text,
-            'lines': lines,
-            'line_count': len(lines),
-            'character_count': len(input_text)
-        }
+        def counted(blocks):
+            nonlocal character_count
+            for block in blocks:
+                character_count += len(block)
+                f.write(json.dumps(block, ensure_ascii=False)[1:-1])
+                yield block
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'w', encoding='utf-8') as f, \
+                tempfile.TemporaryFile('w+', encoding='utf-8') as spool:
+            f.write('{\n  "content": "')
+            for line in iter_lines(counted(blocks)):
+                if line.strip():
+                    spool.write(json.dumps(line, ensure_ascii=False))
+                    spool.write('\n')
+                    line_count += 1
+            f.write('",\n  "lines": ')
+            
+            if line_count:
+                spool.seek(0)
+                f.write('[')
+                for idx, encoded in enumerate(spool):
+                    f.write(',\n    ' if idx else '\n    ')
+                    f.write(encoded[:-1])
+                f.write('\n  ]')
+            else:
+                f.write('[]')
+            
+            f.write(f',\n  "line_count": {line_count},\n  "character_count": {character_count}\n}}')
         
         return output_path
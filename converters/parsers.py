@@ -1,206 +1,896 @@
 import os
 import json
 import csv
+import codecs
+import zipfile
 import xml.etree.ElementTree as ET
 from html import unescape
+from html.parser import HTMLParser as StdlibHTMLParser
 import re
+from importlib import import_module
+
+from .workers import submit, parallel_available, WORKER_COUNT
+
+class ParseResult:
+    def __init__(self, text, stats=None):
+        self.text = text
+        self.stats = stats or {}
+
+BLOCK_SIZE = 64 * 1024
 
 class BaseParser:
+    VERSION = 2
+    STREAMING = False
+    
+    OPTIONS = ()
+    
+    @classmethod
+    def parse(cls, file_path, options=None):
+        return cls.parse_result(file_path, options).text
+    
     @staticmethod
-    def parse(file_path):
+    def parse_result(file_path, options=None):
         raise NotImplementedError
+    
+    @classmethod
+    def iter_blocks(cls, file_path, stats=None, options=None):
+        result = cls.parse_result(file_path, options)
+        if stats is not None:
+            stats.update(result.stats)
+        yield result.text
 
 class TXTParser(BaseParser):
+    STREAMING = True
+    
     @staticmethod
-    def parse(file_path):
+    def parse_result(file_path, options=None):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return ParseResult(f.read())
+    
+    @classmethod
+    def iter_blocks(cls, file_path, stats=None, options=None):
         with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+            for block in iter(lambda: f.read(BLOCK_SIZE), ''):
+                yield block
+
+def parse_page_range(pages, page_count):
+    if isinstance(pages, str):
+        selected = set()
+        for part in pages.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            start, _, end = part.partition('-')
+            start = int(start) if start.strip() else 1
+            end = int(end) if end.strip() else (page_count if _ else start)
+            if start < 1 or end < start:
+                raise ValueError(f"Invalid page range: {part}")
+            selected.update(range(start, min(end, page_count) + 1))
+    elif isinstance(pages, (list, tuple)):
+        selected = {int(page) for page in pages if 1 <= int(page) <= page_count}
+    else:
+        raise ValueError("Page range must be a string such as '1-5,8' or a list of page numbers")
+    return [page - 1 for page in sorted(selected)]
+
+def extract_pdf_pages(file_path, indices):
+    import PyPDF2
+    with open(file_path, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        return [pdf_reader.pages[index].extract_text() for index in indices]
 
 class PDFParser(BaseParser):
+    OPTIONS = ('pages',)
+    PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 32))
+    
     @staticmethod
-    def parse(file_path):
+    def parse_result(file_path, options=None):
         try:
             import PyPDF2
-            text = ""
             with open(file_path, 'rb') as f:
                 pdf_reader = PyPDF2.PdfReader(f)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
+                page_count = len(pdf_reader.pages)
+                indices = list(range(page_count))
+                if options and options.get('pages') is not None:
+                    indices = parse_page_range(options['pages'], page_count)
+                
+                ranges = PDFParser.split_pages(indices)
+                if len(ranges) > 1:
+                    futures = [submit(extract_pdf_pages, file_path, chunk) for chunk in ranges]
+                    pages = [text for future in futures for text in future.result()]
+                else:
+                    pages = [pdf_reader.pages[index].extract_text() for index in indices]
+            return ParseResult("\n".join(pages).strip(), {'page_count': page_count})
         except ImportError:
             raise ImportError("PyPDF2 is required for PDF parsing. Install it with: pip install PyPDF2")
         except Exception as e:
             raise ValueError(f"Failed to parse PDF: {str(e)}")
+    
+    @staticmethod
+    def split_pages(indices):
+        if not parallel_available():
+            return [indices]
+        if len(indices) < PDFParser.PARALLEL_MIN_PAGES:
+            return [indices]
+        
+        chunk_count = min(WORKER_COUNT, len(indices) // (PDFParser.PARALLEL_MIN_PAGES // 2 or 1))
+        chunk_size = -(-len(indices) // chunk_count)
+        return [indices[i:i + chunk_size] for i in range(0, len(indices), chunk_size)]
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+ODF_TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+
+def iter_docx_paragraphs(file_path):
+    paragraph_tag = WORD_NS + 'p'
+    run_tag = WORD_NS + 'r'
+    text_tag = WORD_NS + 't'
+    breaks = {WORD_NS + 'tab': '\t', WORD_NS + 'ptab': '\t', WORD_NS + 'br': '\n',
+              WORD_NS + 'cr': '\n', WORD_NS + 'noBreakHyphen': '-'}
+    
+    with zipfile.ZipFile(file_path) as package:
+        with package.open('word/document.xml') as document:
+            elements = []
+            paragraphs = []
+            run_depth = 0
+            for event, elem in ET.iterparse(document, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    elements.append(elem)
+                    if tag == paragraph_tag:
+                        paragraphs.append([])
+                    elif tag == run_tag:
+                        run_depth += 1
+                    elif run_depth and tag in breaks and paragraphs:
+                        paragraphs[-1].append(breaks[tag])
+                    continue
+                
+                if tag == text_tag and paragraphs and elem.text:
+                    paragraphs[-1].append(elem.text)
+                elif tag == run_tag:
+                    run_depth -= 1
+                elif tag == paragraph_tag:
+                    yield ''.join(paragraphs.pop())
+                
+                elements.pop()
+                if elements:
+                    elements[-1].remove(elem)
+
+def odt_element_text(root):
+    space_tag = ODF_TEXT_NS + 's'
+    count_attr = ODF_TEXT_NS + 'c'
+    specials = {ODF_TEXT_NS + 'tab': '\t', ODF_TEXT_NS + 'line-break': '\n'}
+    
+    parts = [root.text] if root.text else []
+    stack = [iter(root)]
+    nodes = [root]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            node = nodes.pop()
+            if stack and node.tail:
+                parts.append(node.tail)
+            continue
+        if child.tag == space_tag:
+            parts.append(' ' * int(child.get(count_attr, 1)))
+        elif child.tag in specials:
+            parts.append(specials[child.tag])
+        elif child.text:
+            parts.append(child.text)
+        stack.append(iter(child))
+        nodes.append(child)
+    return ''.join(parts)
+
+def iter_odt_paragraphs(file_path):
+    paragraph_tags = (ODF_TEXT_NS + 'p', ODF_TEXT_NS + 'h')
+    
+    with zipfile.ZipFile(file_path) as package:
+        with package.open('content.xml') as content:
+            elements = []
+            paragraph_depth = 0
+            for event, elem in ET.iterparse(content, events=('start', 'end')):
+                if event == 'start':
+                    elements.append(elem)
+                    if elem.tag in paragraph_tags:
+                        paragraph_depth += 1
+                    continue
+                
+                elements.pop()
+                if elem.tag in paragraph_tags:
+                    paragraph_depth -= 1
+                    if paragraph_depth == 0:
+                        yield odt_element_text(elem)
+                if paragraph_depth == 0 and elements:
+                    elements[-1].remove(elem)
+
+def iter_paragraph_blocks(paragraphs, stats):
+    paragraph_count = 0
+    word_count = 0
+    first = True
+    for paragraph in paragraphs:
+        paragraph_count += 1
+        word_count += len(paragraph.split())
+        if paragraph.strip():
+            yield paragraph if first else "\n" + paragraph
+            first = False
+    stats['paragraph_count'] = paragraph_count
+    stats['word_count'] = word_count
+
+def iter_xml_text(file_path, stats):
+    frames = []
+    element_count = 0
+    for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+        if event == 'start':
+            element_count += 1
+            if frames:
+                parent, previous = frames[-1]
+                text = parent.text if previous is None else previous.tail
+                if text and text.strip():
+                    yield text.strip()
+            frames.append([elem, None])
+            continue
+        
+        _, previous = frames.pop()
+        text = elem.text if previous is None else previous.tail
+        if text and text.strip():
+            yield text.strip()
+        elif previous is None:
+            yield ""
+        if frames:
+            frames[-1][1] = elem
+            frames[-1][0].remove(elem)
+    stats['element_count'] = element_count
 
 class DOCXParser(BaseParser):
+    VERSION = 3
+    STREAMING = True
+    
+    @classmethod
+    def parse_result(cls, file_path, options=None):
+        stats = {}
+        text = "".join(cls.iter_blocks(file_path, stats, options))
+        return ParseResult(text, stats)
+    
     @staticmethod
-    def parse(file_path):
+    def iter_blocks(file_path, stats=None, options=None):
+        if stats is None:
+            stats = {}
         try:
-            from docx import Document
-            doc = Document(file_path)
-            text = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    text.append(para.text)
-            return "\n".join(text)
+            yield from iter_paragraph_blocks(iter_docx_paragraphs(file_path), stats)
         except Exception as e:
             raise ValueError(f"Failed to parse DOCX: {str(e)}")
 
+HTML_PARSER_BACKEND = os.environ.get('HTML_PARSER_BACKEND', 'stdlib')
+HTML_SKIP_TAGS = frozenset(['script', 'style'])
+HTML_PRESERVE_TAGS = frozenset(['pre', 'textarea'])
+HTML_ASCII_SPACES = ' \n\t\x0c\r'
+HTML_LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+class HTMLTextCollector:
+    def __init__(self):
+        self.parts = []
+        self.segment = []
+        self.carry = ''
+        self.tag_count = 0
+        self.skip_depth = 0
+        self.preserve_depth = 0
+    
+    def start(self, tag, attrib=None):
+        self.boundary()
+        self.tag_count += 1
+        if tag in HTML_SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in HTML_PRESERVE_TAGS:
+            self.preserve_depth += 1
+    
+    def end(self, tag):
+        self.boundary()
+        if tag in HTML_SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag in HTML_PRESERVE_TAGS and self.preserve_depth:
+            self.preserve_depth -= 1
+    
+    def data(self, data):
+        if not self.skip_depth:
+            self.segment.append(data)
+    
+    def comment(self, text=None):
+        self.boundary()
+    
+    def boundary(self):
+        if not self.segment:
+            return
+        text = ''.join(self.segment)
+        self.segment = []
+        if not self.preserve_depth and not text.strip(HTML_ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+        self.parts.append(text)
+    
+    def close(self):
+        self.boundary()
+    
+    def phrases(self, final=False):
+        text = self.carry + ''.join(self.parts)
+        self.parts = []
+        self.carry = ''
+        lines = text.splitlines()
+        if not final and lines and text[-1] not in HTML_LINE_BREAKS:
+            self.carry = lines.pop()
+        
+        phrases = []
+        for line in lines:
+            for phrase in line.strip().split("  "):
+                phrase = phrase.strip()
+                if phrase:
+                    phrases.append(phrase)
+        return phrases
+
+class StdlibHTMLEvents(StdlibHTMLParser):
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+    
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag)
+    
+    def handle_startendtag(self, tag, attrs):
+        self.target.boundary()
+        self.target.tag_count += 1
+    
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+    
+    def handle_data(self, data):
+        self.target.data(data)
+    
+    def handle_comment(self, data):
+        self.target.comment(data)
+    
+    def handle_decl(self, decl):
+        self.target.boundary()
+    
+    def handle_pi(self, data):
+        self.target.boundary()
+    
+    def unknown_decl(self, data):
+        self.target.boundary()
+        if data.startswith('CDATA['):
+            self.target.data(data[6:])
+            self.target.boundary()
+
+def html_event_parser(target, backend=None):
+    backend = backend or HTML_PARSER_BACKEND
+    if backend in ('auto', 'lxml'):
+        try:
+            from lxml import etree
+            return etree.HTMLParser(target=target)
+        except ImportError:
+            if backend == 'lxml':
+                raise ImportError("lxml is required for HTML_PARSER_BACKEND=lxml. Install it with: pip install lxml")
+    return StdlibHTMLEvents(target)
+
+def iter_html_text(chunks, stats, backend=None):
+    collector = HTMLTextCollector()
+    parser = html_event_parser(collector, backend)
+    first = True
+    for chunk in chunks:
+        parser.feed(chunk)
+        phrases = collector.phrases()
+        if phrases:
+            yield ("" if first else "\n") + "\n".join(phrases)
+            first = False
+    parser.close()
+    collector.close()
+    phrases = collector.phrases(final=True)
+    if phrases:
+        yield ("" if first else "\n") + "\n".join(phrases)
+    stats['tag_count'] = collector.tag_count
+
 class HTMLParser(BaseParser):
+    VERSION = 4
+    STREAMING = True
+    
+    @classmethod
+    def parse_result(cls, file_path, options=None):
+        stats = {}
+        text = "".join(cls.iter_blocks(file_path, stats, options))
+        return ParseResult(text, stats)
+    
     @staticmethod
-    def parse(file_path):
+    def iter_blocks(file_path, stats=None, options=None):
+        if stats is None:
+            stats = {}
         try:
-            from bs4 import BeautifulSoup
             with open(file_path, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                text = soup.get_text()
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = '\n'.join(chunk for chunk in chunks if chunk)
-            return text
+                yield from iter_html_text(iter(lambda: f.read(BLOCK_SIZE), ''), stats)
         except ImportError:
-            raise ImportError("BeautifulSoup4 is required for HTML parsing. Install it with: pip install beautifulsoup4")
+            raise
         except Exception as e:
             raise ValueError(f"Failed to parse HTML: {str(e)}")
 
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_NUMBER = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+JSON_CONSTANTS = (('true', 'True'), ('false', 'False'), ('null', 'None'),
+                  ('NaN', 'nan'), ('Infinity', 'inf'), ('-Infinity', '-inf'))
+JSON_LOOKAHEAD = 32
+
+def iter_json_leaves(f, stats):
+    buffer = ''
+    pos = 0
+    offset = 0
+    eof = False
+    stack = []
+    expect = 'value'
+    records = 0
+    top = None
+    
+    def more(size=BLOCK_SIZE):
+        nonlocal buffer, pos, offset, eof
+        chunk = f.read(max(size, BLOCK_SIZE))
+        if not chunk:
+            eof = True
+            return False
+        offset += pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+    
+    def error(message):
+        return ValueError(f"{message} at char {offset + pos}")
+    
+    while True:
+        pos = JSON_WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if more():
+                continue
+            break
+        
+        char = buffer[pos]
+        if expect == 'colon':
+            if char != ':':
+                raise error("Expecting ':' delimiter")
+            pos += 1
+            expect = 'value'
+            continue
+        
+        if expect == 'next':
+            kind = stack[-1][0]
+            if char == ',':
+                pos += 1
+                expect = 'key' if kind == '{' else 'value'
+                continue
+            if char != ('}' if kind == '{' else ']'):
+                raise error("Expecting ',' delimiter")
+            leaf = None
+        elif expect in ('key', 'first_key'):
+            if char == '}' and expect == 'first_key':
+                leaf = None
+            elif char == '"':
+                while True:
+                    try:
+                        _, pos = json.decoder.scanstring(buffer, pos + 1, True)
+                        break
+                    except json.JSONDecodeError:
+                        if not more(len(buffer)):
+                            raise
+                expect = 'colon'
+                continue
+            else:
+                raise error("Expecting property name enclosed in double quotes")
+        elif char == '{':
+            stack.append(['{', 0])
+            pos += 1
+            expect = 'first_key'
+            continue
+        elif char == '[':
+            stack.append(['[', 0])
+            pos += 1
+            expect = 'first_value'
+            continue
+        elif char == ']' and expect == 'first_value':
+            leaf = None
+        elif char == '"':
+            while True:
+                try:
+                    leaf, pos = json.decoder.scanstring(buffer, pos + 1, True)
+                    break
+                except json.JSONDecodeError:
+                    if not more(len(buffer)):
+                        raise
+        else:
+            while len(buffer) - pos < JSON_LOOKAHEAD and more():
+                pass
+            match = JSON_NUMBER.match(buffer, pos)
+            while match and match.end() == len(buffer) and more(len(buffer)):
+                match = JSON_NUMBER.match(buffer, pos)
+            if match:
+                integer, fraction, exponent = match.groups()
+                leaf = str(float(match.group()) if fraction or exponent else int(integer))
+                pos = match.end()
+            else:
+                for literal, leaf in JSON_CONSTANTS:
+                    if buffer.startswith(literal, pos):
+                        pos += len(literal)
+                        break
+                else:
+                    raise error("Expecting value")
+        
+        if leaf is None:
+            pos += 1
+            kind, count = stack.pop()
+            if not stack:
+                top = (kind, count)
+        else:
+            yield leaf
+        
+        if stack:
+            stack[-1][1] += 1
+            expect = 'next'
+        else:
+            records += 1
+            expect = 'value'
+    
+    if stack or expect != 'value' or not records:
+        raise error("Expecting value" if not records else "Unexpected end of data")
+    if records > 1:
+        stats['item_count'] = records
+    elif top:
+        stats['key_count' if top[0] == '{' else 'item_count'] = top[1]
+
+def iter_json_values(data):
+    stack = [iter([data])]
+    while stack:
+        obj = next(stack[-1], stack)
+        if obj is stack:
+            stack.pop()
+        elif isinstance(obj, dict):
+            stack.append(iter(obj.values()))
+        elif isinstance(obj, list):
+            stack.append(iter(obj))
+        else:
+            yield str(obj)
+
 class JSONParser(BaseParser):
+    VERSION = 3
+    STREAMING = True
+    LOAD_MAX_BYTES = int(os.environ.get('JSON_LOAD_MAX_BYTES', 8 * 1024 * 1024))
+    
+    @classmethod
+    def parse_result(cls, file_path, options=None):
+        if os.path.getsize(file_path) <= cls.LOAD_MAX_BYTES:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except json.JSONDecodeError as e:
+                if not e.msg.startswith('Extra data'):
+                    raise ValueError(f"Failed to parse JSON: {str(e)}")
+            except RecursionError:
+                pass
+            except Exception as e:
+                raise ValueError(f"Failed to parse JSON: {str(e)}")
+            else:
+                stats = {}
+                if isinstance(data, dict):
+                    stats['key_count'] = len(data)
+                elif isinstance(data, list):
+                    stats['item_count'] = len(data)
+                return ParseResult("\n".join(iter_json_values(data)), stats)
+        
+        stats = {}
+        text = "".join(cls.iter_blocks(file_path, stats, options))
+        return ParseResult(text, stats)
+    
     @staticmethod
-    def parse(file_path):
+    def iter_blocks(file_path, stats=None, options=None):
+        if stats is None:
+            stats = {}
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            def extract_text(obj, lines=None):
-                if lines is None:
-                    lines = []
-                if isinstance(obj, dict):
-                    for key, value in obj.items():
-                        if isinstance(value, (dict, list)):
-                            extract_text(value, lines)
-                        else:
-                            lines.append(str(value))
-                elif isinstance(obj, list):
-                    for item in obj:
-                        extract_text(item, lines)
-                else:
-                    lines.append(str(obj))
-                return lines
-            
-            text_lines = extract_text(data)
-            return "\n".join(text_lines)
+                parts = []
+                size = 0
+                first = True
+                for leaf in iter_json_leaves(f, stats):
+                    parts.append(leaf)
+                    size += len(leaf) + 1
+                    if size >= BLOCK_SIZE:
+                        yield ("" if first else "\n") + "\n".join(parts)
+                        first = False
+                        parts = []
+                        size = 0
+                if parts:
+                    yield ("" if first else "\n") + "\n".join(parts)
         except Exception as e:
             raise ValueError(f"Failed to parse JSON: {str(e)}")
 
 class CSVParser(BaseParser):
+    STREAMING = True
+    
+    @classmethod
+    def parse_result(cls, file_path, options=None):
+        stats = {}
+        text = "".join(cls.iter_blocks(file_path, stats, options))
+        return ParseResult(text, stats)
+    
     @staticmethod
-    def parse(file_path):
+    def iter_blocks(file_path, stats=None, options=None):
+        if stats is None:
+            stats = {}
         try:
-            text_lines = []
+            row_count = 0
             with open(file_path, 'r', encoding='utf-8', newline='') as f:
                 reader = csv.reader(f)
                 for row in reader:
-                    text_lines.append(" | ".join(row))
-            return "\n".join(text_lines)
+                    if row_count == 0:
+                        stats['column_count'] = len(row)
+                        yield " | ".join(row)
+                    else:
+                        yield "\n" + " | ".join(row)
+                    row_count += 1
+            stats['row_count'] = row_count
         except Exception as e:
             raise ValueError(f"Failed to parse CSV: {str(e)}")
 
 class XMLParser(BaseParser):
+    VERSION = 3
+    STREAMING = True
+    
+    @classmethod
+    def parse_result(cls, file_path, options=None):
+        stats = {}
+        text = "".join(cls.iter_blocks(file_path, stats, options))
+        return ParseResult(text, stats)
+    
     @staticmethod
-    def parse(file_path):
+    def iter_blocks(file_path, stats=None, options=None):
+        if stats is None:
+            stats = {}
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            def extract_text(elem):
-                text_parts = []
-                if elem.text and elem.text.strip():
-                    text_parts.append(elem.text.strip())
-                for child in elem:
-                    text_parts.append(extract_text(child))
-                    if child.tail and child.tail.strip():
-                        text_parts.append(child.tail.strip())
-                return "\n".join(text_parts)
-            
-            return extract_text(root)
+            first = True
+            for part in iter_xml_text(file_path, stats):
+                yield part if first else "\n" + part
+                first = False
         except Exception as e:
             raise ValueError(f"Failed to parse XML: {str(e)}")
 
+RTF_TOKEN = re.compile(r"\\(?:([a-zA-Z]{1,32})(-?\d{1,10})? ?|'([0-9a-fA-F]{2})|(.))|([{}])|[\r\n]+|([^\\{}\r\n]+)", re.S)
+RTF_DESTINATIONS = frozenset([
+    'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'shppict', 'nonshppict', 'object', 'objdata',
+    'header', 'headerl', 'headerr', 'headerf', 'footer', 'footerl', 'footerr', 'footerf',
+    'listtable', 'listoverridetable', 'listtext', 'pntext', 'pntxta', 'pntxtb', 'revtbl', 'rsidtbl',
+    'filetbl', 'generator', 'xmlnstbl', 'themedata', 'colorschememapping', 'latentstyles', 'datastore',
+    'fldinst', 'bkmkstart', 'bkmkend', 'author', 'operator', 'title', 'subject', 'keywords',
+    'comment', 'doccomm', 'company', 'creatim', 'revtim', 'printim', 'buptim',
+])
+RTF_WORDS = {
+    'par': '\n', 'line': '\n', 'sect': '\n', 'page': '\n', 'row': '\n', 'tab': '\t', 'cell': '\t',
+    'emdash': '\u2014', 'endash': '\u2013', 'bullet': '\u2022', 'lquote': '\u2018', 'rquote': '\u2019',
+    'ldblquote': '\u201c', 'rdblquote': '\u201d', 'emspace': ' ', 'enspace': ' ', 'qmspace': ' ',
+}
+RTF_SURROGATES = re.compile('[\ud800-\udfff]')
+RTF_SPACES = re.compile(' {2,}')
+RTF_LOOKAHEAD = 48
+RTF_SYMBOLS = {'\\': '\\', '{': '{', '}': '}', '~': ' ', '_': '-', '\n': '\n', '\r': '\n'}
+
+def iter_rtf_lines(f):
+    buffer = ''
+    pos = 0
+    eof = False
+    stack = []
+    skip = False
+    uc = 1
+    fallback = 0
+    binary = 0
+    codepage = 'cp1252'
+    hex_bytes = bytearray()
+    line = []
+    
+    while True:
+        if binary:
+            taken = min(binary, len(buffer) - pos)
+            pos += taken
+            binary -= taken
+        
+        if not eof and (binary or len(buffer) - pos < RTF_LOOKAHEAD):
+            chunk = f.read(BLOCK_SIZE)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        
+        match = RTF_TOKEN.match(buffer, pos)
+        if match is None:
+            break
+        if match.end() == len(buffer) and not eof and match.group(6) and not skip:
+            chunk = f.read(BLOCK_SIZE)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        pos = match.end()
+        word, param, hex_code, symbol, brace, text = match.groups()
+        
+        if hex_code is not None:
+            if fallback:
+                fallback -= 1
+            elif not skip:
+                hex_bytes.append(int(hex_code, 16))
+            continue
+        if hex_bytes:
+            line.append(bytes(hex_bytes).decode(codepage, 'replace'))
+            hex_bytes.clear()
+        
+        if text is not None:
+            if fallback:
+                dropped = min(fallback, len(text))
+                text = text[dropped:]
+                fallback -= dropped
+            if text and not skip:
+                if not text.isascii():
+                    raw = text.encode('latin-1')
+                    try:
+                        text = raw.decode('utf-8')
+                    except UnicodeDecodeError:
+                        text = raw.decode(codepage, 'replace')
+                line.append(text)
+        elif brace == '{':
+            stack.append((skip, uc))
+            fallback = 0
+        elif brace == '}':
+            if stack:
+                skip, uc = stack.pop()
+            fallback = 0
+        elif word is not None:
+            if word == 'bin' and param:
+                binary = max(int(param), 0)
+            elif fallback:
+                fallback -= 1
+            elif word in RTF_DESTINATIONS:
+                skip = True
+            elif word == 'uc' and param:
+                uc = int(param)
+            elif word == 'u' and param:
+                fallback = uc
+                if not skip:
+                    line.append(chr(int(param) % 0x10000))
+            elif word == 'ansicpg' and param:
+                try:
+                    codepage = codecs.lookup(f"cp{param}").name
+                except LookupError:
+                    pass
+            elif skip:
+                continue
+            elif word in RTF_WORDS:
+                if RTF_WORDS[word] == '\n':
+                    yield ''.join(line)
+                    line = []
+                else:
+                    line.append(RTF_WORDS[word])
+        elif symbol is not None:
+            if symbol == '*':
+                skip = True
+            elif fallback:
+                fallback -= 1
+            elif not skip and symbol in RTF_SYMBOLS:
+                if RTF_SYMBOLS[symbol] == '\n':
+                    yield ''.join(line)
+                    line = []
+                else:
+                    line.append(RTF_SYMBOLS[symbol])
+    
+    if hex_bytes:
+        line.append(bytes(hex_bytes).decode(codepage, 'replace'))
+    yield ''.join(line)
+
+def join_surrogates(text):
+    if not RTF_SURROGATES.search(text):
+        return text
+    return text.encode('utf-16', 'surrogatepass').decode('utf-16', 'replace')
+
 class RTFParser(BaseParser):
+    VERSION = 3
+    STREAMING = True
+    
+    @classmethod
+    def parse_result(cls, file_path, options=None):
+        stats = {}
+        text = "".join(cls.iter_blocks(file_path, stats, options))
+        return ParseResult(text, stats)
+    
     @staticmethod
-    def parse(file_path):
+    def iter_blocks(file_path, stats=None, options=None):
+        if stats is None:
+            stats = {}
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            text = re.sub(r'\\[a-z]+\d*\s?', '', content)
-            text = re.sub(r'\{[^}]*\}', '', text)
-            text = text.replace('\\par', '\n')
-            text = text.replace('\\tab', '\t')
-            text = re.sub(r'\s+', ' ', text)
-            text = re.sub(r'\n\s*\n', '\n', text)
-            
-            return text.strip()
+            paragraph_count = 0
+            with open(file_path, 'r', encoding='latin-1', newline='') as f:
+                for line in iter_rtf_lines(f):
+                    line = RTF_SPACES.sub(' ', join_surrogates(line)).strip()
+                    if line:
+                        yield line if paragraph_count == 0 else "\n" + line
+                        paragraph_count += 1
+            stats['paragraph_count'] = paragraph_count
         except Exception as e:
             raise ValueError(f"Failed to parse RTF: {str(e)}")
 
+def extract_html_documents(contents):
+    results = []
+    for content in contents:
+        stats = {}
+        text = "".join(iter_html_text([content.decode('utf-8', 'replace')], stats))
+        results.append((text, stats['tag_count']))
+    return results
+
+def epub_documents(book):
+    import ebooklib
+    from ebooklib import epub
+    
+    items = [book.get_item_with_id(idref) for idref, _ in book.spine]
+    items.extend(book.get_items_of_type(ebooklib.ITEM_DOCUMENT))
+    
+    documents = []
+    seen = set()
+    for item in items:
+        if item is None or item.id in seen or item.get_type() != ebooklib.ITEM_DOCUMENT:
+            continue
+        seen.add(item.id)
+        if isinstance(item, epub.EpubNav):
+            continue
+        documents.append(item)
+    return documents
+
 class EPUBParser(BaseParser):
+    VERSION = 5
+    PARALLEL_MIN_DOCUMENTS = int(os.environ.get('EPUB_PARALLEL_MIN_DOCUMENTS', 16))
+    
     @staticmethod
-    def parse(file_path):
+    def parse_result(file_path, options=None):
         try:
-            import ebooklib
             from ebooklib import epub
-            from bs4 import BeautifulSoup
             
             book = epub.read_epub(file_path)
-            text_parts = []
+            contents = [item.get_content() for item in epub_documents(book)]
             
-            for item in book.get_items():
-                if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-                    text = soup.get_text()
-                    lines = (line.strip() for line in text.splitlines())
-                    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                    text = '\n'.join(chunk for chunk in chunks if chunk)
-                    if text.strip():
-                        text_parts.append(text)
+            chunks = EPUBParser.split_documents(contents)
+            if len(chunks) > 1:
+                futures = [submit(extract_html_documents, chunk) for chunk in chunks]
+                results = [result for future in futures for result in future.result()]
+            else:
+                results = extract_html_documents(contents)
             
-            return "\n\n".join(text_parts)
+            text_parts = [text for text, _ in results if text]
+            tag_count = sum(count for _, count in results)
+            return ParseResult("\n\n".join(text_parts), {'tag_count': tag_count, 'chapter_count': len(results)})
         except ImportError:
-            raise ImportError("BeautifulSoup4 is required for EPUB parsing. Install it with: pip install beautifulsoup4")
+            raise ImportError("ebooklib is required for EPUB parsing. Install it with: pip install ebooklib")
         except Exception as e:
             raise ValueError(f"Failed to parse EPUB: {str(e)}")
+    
+    @staticmethod
+    def split_documents(contents):
+        if not parallel_available():
+            return [contents]
+        if len(contents) < EPUBParser.PARALLEL_MIN_DOCUMENTS:
+            return [contents]
+        
+        chunk_count = min(WORKER_COUNT, len(contents) // (EPUBParser.PARALLEL_MIN_DOCUMENTS // 2 or 1))
+        chunk_size = -(-len(contents) // chunk_count)
+        return [contents[i:i + chunk_size] for i in range(0, len(contents), chunk_size)]
 
 class ODTParser(BaseParser):
+    VERSION = 3
+    STREAMING = True
+    
+    @classmethod
+    def parse_result(cls, file_path, options=None):
+        stats = {}
+        text = "".join(cls.iter_blocks(file_path, stats, options))
+        return ParseResult(text, stats)
+    
     @staticmethod
-    def parse(file_path):
+    def iter_blocks(file_path, stats=None, options=None):
+        if stats is None:
+            stats = {}
         try:
-            from odf.opendocument import load
-            from odf.text import P, H
-            
-            doc = load(file_path)
-            text_parts = []
-            
-            for element in doc.getElementsByType(P):
-                text = ""
-                for node in element.childNodes:
-                    if node.nodeType == 3:
-                        text += node.data
-                if text.strip():
-                    text_parts.append(text)
-            
-            for element in doc.getElementsByType(H):
-                text = ""
-                for node in element.childNodes:
-                    if node.nodeType == 3:
-                        text += node.data
-                if text.strip():
-                    text_parts.append(text)
-            
-            return "\n".join(text_parts)
+            yield from iter_paragraph_blocks(iter_odt_paragraphs(file_path), stats)
         except Exception as e:
             raise ValueError(f"Failed to parse ODT: {str(e)}")
 
@@ -217,6 +907,18 @@ PARSERS = {
     'odt': ODTParser,
 }
 
+PARSER_LIBRARIES = ('PyPDF2', 'ebooklib.epub')
+
+def preload():
+    libraries = PARSER_LIBRARIES
+    if HTML_PARSER_BACKEND != 'stdlib':
+        libraries += ('lxml.etree',)
+    for library in libraries:
+        try:
+            import_module(library)
+        except ImportError:
+            pass
+
 def get_parser(file_extension):
     extension = file_extension.lower().lstrip('.')
     parser_class = PARSERS.get(extension)
@@ -1,26 +1,129 @@
-from .base import BaseConverter
+from .base import BaseConverter, iter_lines
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from collections import deque
+from itertools import chain
+import os
+
+from .workers import submit, parallel_available, WORKER_COUNT
+
+FAST_FONT_NAME = 'Helvetica'
+FAST_FONT_SIZE = 10
+FAST_LEADING = 12
+FAST_SPACE_AFTER = 0.2 * inch
+FAST_MARGIN = inch + 6
+PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_RENDER_PAGES', 200))
+PARALLEL_CHUNK_PAGES = int(os.environ.get('PDF_RENDER_CHUNK_PAGES', 100))
+PARAGRAPH_MARKUP_TABLE = {ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;'}
+
+def wrap_line(line, width, font_name=FAST_FONT_NAME, font_size=FAST_FONT_SIZE):
+    if stringWidth(line, font_name, font_size) <= width:
+        return [line]
+    
+    wrapped = []
+    for piece in simpleSplit(line, font_name, font_size, width):
+        while len(piece) > 1 and stringWidth(piece, font_name, font_size) > width:
+            low, high = 1, len(piece) - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                if stringWidth(piece[:middle], font_name, font_size) <= width:
+                    low = middle
+                else:
+                    high = middle - 1
+            wrapped.append(piece[:low])
+            piece = piece[low:]
+        wrapped.append(piece)
+    return wrapped or ['']
+
+def layout_pages(lines):
+    page_width, page_height = letter
+    width = page_width - 2 * FAST_MARGIN
+    top = page_height - FAST_MARGIN
+    bottom = FAST_MARGIN
+    
+    page = []
+    emitted = False
+    y = top
+    
+    for line in lines:
+        if line.strip():
+            for wrapped in wrap_line(line.expandtabs(4), width):
+                if y - FAST_LEADING < bottom:
+                    yield page
+                    emitted = True
+                    page = []
+                    y = top
+                y -= FAST_LEADING
+                page.append((y + FAST_LEADING - FAST_FONT_SIZE, wrapped))
+        y -= FAST_SPACE_AFTER
+        if y < bottom:
+            yield page
+            emitted = True
+            page = []
+            y = top
+    
+    if page or not emitted:
+        yield page
+
+def draw_pages(pages, output_path):
+    # reportlab keeps each finished page's compressed stream until save()
+    pdf = canvas.Canvas(output_path, pagesize=letter, pageCompression=1)
+    for page in pages:
+        if page:
+            text = pdf.beginText()
+            text.setFont(FAST_FONT_NAME, FAST_FONT_SIZE)
+            for y, line in page:
+                text.setTextOrigin(FAST_MARGIN, y)
+                text.textOut(line)
+            pdf.drawText(text)
+        pdf.showPage()
+    pdf.save()
+    return output_path
+
+def merge_pdfs(part_paths, output_path):
+    from PyPDF2 import PdfWriter
+    writer = PdfWriter()
+    for part_path in part_paths:
+        writer.append(part_path)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
 
 class PDFConverter(BaseConverter):
+    STREAMING = True
+    
     def __init__(self):
         super().__init__()
         self.supported_extensions = ['pdf']
     
+    def warm(self):
+        self.resource('paragraph_style', self.build_paragraph_style)
+        stringWidth(' ', FAST_FONT_NAME, FAST_FONT_SIZE)
+    
+    @staticmethod
+    def build_paragraph_style():
+        return getSampleStyleSheet()['Normal']
+    
     def convert(self, input_text, output_path, options=None):
         self.validate_input(input_text)
+        
+        if self.use_fast_renderer(options):
+            return self.convert_stream([input_text], output_path, options)
+        
         self.ensure_output_dir(output_path)
         
         doc = SimpleDocTemplate(output_path, pagesize=letter)
-        styles = getSampleStyleSheet()
+        style = self.resource('paragraph_style', self.build_paragraph_style)
         story = []
         
         lines = input_text.split('\n')
         for line in lines:
             if line.strip():
-                para = Paragraph(line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;'), styles['Normal'])
+                para = Paragraph(line.translate(PARAGRAPH_MARKUP_TABLE), style)
                 story.append(para)
                 story.append(Spacer(1, 0.2*inch))
             else:
@@ -28,3 +131,65 @@ class PDFConverter(BaseConverter):
         
         doc.build(story)
         return output_path
+    
+    def convert_stream(self, blocks, output_path, options=None):
+        blocks = self.validate_blocks(blocks)
+        if not self.use_fast_renderer(options):
+            return self.convert(''.join(blocks), output_path, options)
+        
+        self.ensure_output_dir(output_path)
+        self.render_lines(iter_lines(blocks), output_path, options.get('parallel', True))
+        return output_path
+    
+    @staticmethod
+    def use_fast_renderer(options):
+        return bool(options) and options.get('mode') == 'fast'
+    
+    @staticmethod
+    def render_lines(lines, output_path, parallel=True):
+        pages = layout_pages(lines)
+        if not parallel or not parallel_available():
+            return draw_pages(pages, output_path)
+        
+        head = []
+        for page in pages:
+            head.append(page)
+            if len(head) >= PARALLEL_MIN_PAGES:
+                break
+        else:
+            return draw_pages(head, output_path)
+        
+        return PDFConverter.render_parallel(head, pages, output_path)
+    
+    @staticmethod
+    def render_parallel(head, pages, output_path):
+        part_paths = []
+        futures = deque()
+        
+        def chunks():
+            chunk = []
+            for page in chain(head, pages):
+                if len(chunk) >= PARALLEL_CHUNK_PAGES:
+                    yield chunk
+                    chunk = []
+                chunk.append(page)
+            if chunk:
+                yield chunk
+        
+        try:
+            for chunk in chunks():
+                while len(futures) >= WORKER_COUNT * 2:
+                    futures.popleft().result()
+                part_path = f"{output_path}.part{len(part_paths)}"
+                part_paths.append(part_path)
+                futures.append(submit(draw_pages, chunk, part_path))
+            while futures:
+                futures.popleft().result()
+            merge_pdfs(part_paths, output_path)
+        finally:
+            for future in futures:
+                future.cancel()
+            for part_path in part_paths:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+        return output_path
@@ -1,30 +1,47 @@
-from .base import BaseConverter
-import html
+from .base import BaseConverter, WRITE_BUFFER_SIZE
+import re
+
+RTF_HEADER = r"""{\rtf1\ansi\deff0
+{\fonttbl{\f0 Times New Roman;}}
+\f0\fs24
+"""
+
+RTF_TEXT_TABLE = {ord('\\'): '\\\\', ord('{'): '\\{', ord('}'): '\\}', ord('\n'): '\\par\n'}
+RTF_NON_ASCII = re.compile('[^\x00-\x7f]')
+
+def escape_rtf_char(match):
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return f"\\u{(0xD800 + (code >> 10)) - 0x10000}?\\u{(0xDC00 + (code & 0x3FF)) - 0x10000}?"
+    return f"\\u{code - 0x10000 if code > 0x7FFF else code}?"
+
+def escape_rtf(text):
+    text = text.translate(RTF_TEXT_TABLE)
+    if not text.isascii():
+        text = RTF_NON_ASCII.sub(escape_rtf_char, text)
+    return text
 
 class RTFConverter(BaseConverter):
+    VERSION = 2
+    STREAMING = True
+    
     def __init__(self):
         super().__init__()
         self.supported_extensions = ['rtf']
     
     def convert(self, input_text, output_path, options=None):
         self.validate_input(input_text)
+        return self.convert_stream([input_text], output_path, options)
+    
+    def convert_stream(self, blocks, output_path, options=None):
+        blocks = self.validate_blocks(blocks)
         self.ensure_output_dir(output_path)
         
-        def escape_rtf(text):
-            text = text.replace('\\', '\\\\')
-            text = text.replace('{', '\\{')
-            text = text.replace('}', '\\}')
-            text = text.replace('\n', '\\par\n')
-            return text
-        
-        rtf_content = r"""{\rtf1\ansi\deff0
-{\fonttbl{\f0 Times New Roman;}}
-\f0\fs24
-"""
-        rtf_content += escape_rtf(input_text)
-        rtf_content += "\n}"
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(rtf_content)
+        with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(RTF_HEADER)
+            for block in blocks:
+                f.write(escape_rtf(block))
+            f.write("\n}")
         
         return output_path
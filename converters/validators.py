@@ -1,5 +1,18 @@
 import os
-from .parsers import get_parser
+import codecs
+import struct
+from .cache import parse_cache
+
+SNIFF_BYTES = 8 * 1024
+TEXT_EXTENSIONS = {'txt', 'csv', 'json', 'html'}
+ZIP_EXTENSIONS = {'docx', 'odt', 'epub'}
+ZIP_MIMETYPES = {
+    'odt': b'application/vnd.oasis.opendocument.text',
+    'epub': b'application/epub+zip',
+}
+ZIP_LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+JSON_START_BYTES = b'{["-0123456789tfn'
+XML_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE, codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)
 
 def get_file_metadata(file_path, file_extension):
     metadata = {
@@ -10,67 +23,97 @@ def get_file_metadata(file_path, file_extension):
     }
     
     try:
-        parser = get_parser(file_extension)
-        content = parser.parse(file_path)
+        summary = parse_cache.summary(file_path, file_extension)
         
         metadata['valid'] = True
-        metadata['character_count'] = len(content)
-        metadata['line_count'] = len(content.split('\n'))
-        
-        if file_extension == 'pdf':
-            try:
-                import PyPDF2
-                with open(file_path, 'rb') as f:
-                    pdf_reader = PyPDF2.PdfReader(f)
-                    metadata['page_count'] = len(pdf_reader.pages)
-            except:
-                pass
-        
-        elif file_extension == 'docx':
-            try:
-                from docx import Document
-                doc = Document(file_path)
-                metadata['paragraph_count'] = len(doc.paragraphs)
-                word_count = sum(len(para.text.split()) for para in doc.paragraphs)
-                metadata['word_count'] = word_count
-            except:
-                pass
-        
-        elif file_extension == 'html':
-            try:
-                from bs4 import BeautifulSoup
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    soup = BeautifulSoup(f.read(), 'html.parser')
-                    metadata['tag_count'] = len(soup.find_all())
-            except:
-                pass
-        
-        elif file_extension == 'json':
-            import json
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    metadata['key_count'] = len(data)
-                elif isinstance(data, list):
-                    metadata['item_count'] = len(data)
-        
-        elif file_extension == 'csv':
-            import csv
-            with open(file_path, 'r', encoding='utf-8', newline='') as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-                metadata['row_count'] = len(rows)
-                if rows:
-                    metadata['column_count'] = len(rows[0])
-        
-        elif file_extension == 'xml':
-            import xml.etree.ElementTree as ET
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            metadata['element_count'] = len(list(root.iter()))
+        metadata.update(summary)
         
     except Exception as e:
         metadata['error'] = str(e)
         metadata['valid'] = False
     
     return metadata
+
+def sniff_zip(head, file_extension):
+    if not head.startswith(b'PK\x03\x04'):
+        raise ValueError(f"File is not a {file_extension.upper()} package")
+    if len(head) < ZIP_LOCAL_HEADER.size:
+        return
+    
+    fields = ZIP_LOCAL_HEADER.unpack_from(head)
+    method, compressed_size, name_length, extra_length = fields[3], fields[7], fields[9], fields[10]
+    start = ZIP_LOCAL_HEADER.size
+    if head[start:start + name_length] != b'mimetype':
+        return
+    if file_extension not in ZIP_MIMETYPES:
+        raise ValueError(f"File is an OpenDocument or EPUB package, not {file_extension.upper()}")
+    
+    start += name_length + extra_length
+    mimetype = head[start:start + compressed_size]
+    if method == 0 and len(mimetype) == compressed_size and mimetype.strip() != ZIP_MIMETYPES[file_extension]:
+        raise ValueError(f"Package type {mimetype.decode('ascii', 'replace')} does not match .{file_extension}")
+
+def sniff_content(head, file_extension):
+    if not head:
+        return
+    
+    if file_extension == 'pdf':
+        if b'%PDF-' not in head[:1024]:
+            raise ValueError("File does not have a PDF header")
+    elif file_extension in ZIP_EXTENSIONS:
+        sniff_zip(head, file_extension)
+    elif file_extension == 'rtf':
+        if not head.lstrip().startswith(b'{\\rtf'):
+            raise ValueError("File does not have an RTF header")
+    elif file_extension == 'xml':
+        if head.startswith(XML_BOMS):
+            return
+        if head.startswith(codecs.BOM_UTF8):
+            head = head[len(codecs.BOM_UTF8):]
+        text = head.lstrip()
+        if text and not text.startswith(b'<'):
+            raise ValueError("File does not start with XML markup")
+    elif file_extension == 'json':
+        text = head.lstrip()
+        if text and text[0] not in JSON_START_BYTES:
+            raise ValueError("File does not start with a JSON value")
+
+class UploadValidator:
+    def __init__(self, file_extension):
+        self.file_extension = file_extension
+        self._head = bytearray()
+        self._sniffed = False
+        self._decoder = codecs.getincrementaldecoder('utf-8')() if file_extension in TEXT_EXTENSIONS else None
+    
+    def feed(self, data):
+        if not self._sniffed:
+            self._head += data
+            if len(self._head) < SNIFF_BYTES:
+                return b''
+            return self._release()
+        self._check_text(data)
+        return data
+    
+    def close(self):
+        data = self._release() if not self._sniffed else b''
+        if self._decoder is not None:
+            self._check_text(b'', final=True)
+        return data
+    
+    def _release(self):
+        data = bytes(self._head)
+        self._head = bytearray()
+        self._sniffed = True
+        sniff_content(data, self.file_extension)
+        self._check_text(data)
+        return data
+    
+    def _check_text(self, data, final=False):
+        if self._decoder is None:
+            return
+        if b'\x00' in data:
+            raise ValueError("File contains binary data, expected UTF-8 text")
+        try:
+            self._decoder.decode(data, final)
+        except UnicodeDecodeError:
+            raise ValueError("File is not valid UTF-8 text")
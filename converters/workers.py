@@ -0,0 +1,85 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+WORKER_BACKEND = os.environ.get('CONVERTER_BACKEND', 'process')
+WORKER_COUNT = int(os.environ.get('CONVERTER_WORKERS', os.cpu_count() or 1))
+WORKER_START_METHOD = os.environ.get('CONVERTER_START_METHOD') or (
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+WORKER_PRELOAD = ['converters.workers']
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_worker = False
+
+def _mark_worker():
+    global _in_worker
+    _in_worker = True
+
+def in_worker():
+    return _in_worker
+
+def parallel_available():
+    return WORKER_BACKEND == 'process' and WORKER_COUNT > 1 and not _in_worker
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if WORKER_BACKEND == 'thread':
+                _executor = ThreadPoolExecutor(max_workers=WORKER_COUNT, thread_name_prefix='converter')
+            else:
+                context = multiprocessing.get_context(WORKER_START_METHOD)
+                if WORKER_START_METHOD == 'forkserver':
+                    context.set_forkserver_preload(WORKER_PRELOAD)
+                _executor = ProcessPoolExecutor(
+                    max_workers=WORKER_COUNT,
+                    mp_context=context,
+                    initializer=_mark_worker,
+                )
+        return _executor
+
+def submit(fn, *args, **kwargs):
+    global _executor
+    executor = get_executor()
+    try:
+        return executor.submit(fn, *args, **kwargs)
+    except BrokenProcessPool:
+        with _executor_lock:
+            if _executor is executor:
+                _executor = None
+        executor.shutdown(wait=False)
+        return get_executor().submit(fn, *args, **kwargs)
+
+def shutdown(wait=True):
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+def convert_task(upload_path, file_extension, format_type, output_path, options=None, content=None):
+    from . import CONVERTERS
+    from .cache import parse_cache
+    from .parsers import get_parser
+    
+    converter = CONVERTERS[format_type]
+    written = []
+    if _in_worker:
+        parse_cache.on_disk_write = written.append
+    try:
+        if content is None and converter.STREAMING and parse_cache.should_stream(upload_path, file_extension):
+            blocks = get_parser(file_extension).iter_blocks(upload_path, options=options)
+            converter.convert_stream(blocks, output_path, options)
+            return written
+        
+        if content is None:
+            content = parse_cache.parse(upload_path, file_extension, options)
+        converter.convert(content, output_path, options)
+        return written
+    finally:
+        if _in_worker:
+            parse_cache.on_disk_write = None
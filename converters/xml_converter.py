@@ -1,27 +1,35 @@
-from .base import BaseConverter
-import xml.etree.ElementTree as ET
-import html
+from .base import BaseConverter, iter_lines, escape_xml_text, WRITE_BUFFER_SIZE
+
+XML_HEADER = "<?xml version='1.0' encoding='utf-8'?>\n<document type=\"text\">"
+XML_FOOTER = "\n</document>"
+
+def iter_xml_lines(lines):
+    for idx, line in enumerate(lines, start=1):
+        text = escape_xml_text(line)
+        if text:
+            yield f'\n  <line number="{idx}">{text}</line>'
+        else:
+            yield f'\n  <line number="{idx}" />'
 
 class XMLConverter(BaseConverter):
+    VERSION = 2
+    STREAMING = True
+    
     def __init__(self):
         super().__init__()
         self.supported_extensions = ['xml']
     
     def convert(self, input_text, output_path, options=None):
         self.validate_input(input_text)
+        return self.convert_stream([input_text], output_path, options)
+    
+    def convert_stream(self, blocks, output_path, options=None):
+        blocks = self.validate_blocks(blocks)
         self.ensure_output_dir(output_path)
         
-        root = ET.Element('document')
-        root.set('type', 'text')
-        
-        lines = input_text.split('\n')
-        for idx, line in enumerate(lines, start=1):
-            line_elem = ET.SubElement(root, 'line')
-            line_elem.set('number', str(idx))
-            line_elem.text = html.escape(line)
-        
-        tree = ET.ElementTree(root)
-        ET.indent(tree, space='  ')
-        tree.write(output_path, encoding='utf-8', xml_declaration=True)
+        with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(XML_HEADER)
+            f.writelines(iter_xml_lines(iter_lines(blocks)))
+            f.write(XML_FOOTER)
         
         return output_path
@@ -0,0 +1,164 @@
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from converters.workers import submit
+
+MAX_JOBS = 1000
+
+logger = logging.getLogger(__name__)
+
+class Job:
+    def __init__(self, kind, items):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.items = items
+        self.results = [None] * len(items)
+        self.created_at = datetime.now().isoformat()
+        self.completed_at = None
+        self.futures = []
+        self._done = threading.Event()
+        if not items:
+            self._done.set()
+
+    @property
+    def status(self):
+        if all(result is not None for result in self.results):
+            if self.results and all(result['status'] == 'failed' for result in self.results):
+                return 'failed'
+            return 'completed'
+        if any(result is not None for result in self.results):
+            return 'running'
+        if any(future.running() or future.done() for future in self.futures):
+            return 'running'
+        return 'queued'
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        files = []
+        for item, result in zip(self.items, self.results):
+            entry = result if result is not None else dict(item, status='pending')
+            files.append({k: v for k, v in entry.items() if not k.startswith('_')})
+        
+        data = {
+            'job_id': self.id,
+            'type': self.kind,
+            'status': self.status,
+            'created_at': self.created_at,
+            'completed_at': self.completed_at,
+            'files': files,
+            'count': sum(1 for f in files if f['status'] == 'completed'),
+        }
+        if self.kind == 'convert' and files and files[0]['status'] == 'completed':
+            data['output_file'] = files[0]['output_file']
+            data['download_url'] = files[0]['download_url']
+        elif self.kind == 'convert' and files and files[0]['status'] == 'failed':
+            data['error'] = files[0]['error']
+        return data
+
+class JobManager:
+    def __init__(self, max_jobs=MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._finished = queue.Queue()
+        self._finisher = None
+
+    def submit(self, kind, tasks, on_result=None, on_complete=None, max_concurrency=None):
+        job = Job(kind, [item for item, _ in tasks])
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        
+        pending = []
+        for index, (item, task) in enumerate(tasks):
+            if task is None or isinstance(task, Exception):
+                self._enqueue(job, index, task, on_result, on_complete)
+            else:
+                pending.append((index, task))
+        
+        if max_concurrency and len(pending) > max_concurrency:
+            slots = threading.BoundedSemaphore(max_concurrency)
+            feeder = threading.Thread(
+                target=self._feed,
+                args=(job, pending, slots, on_result, on_complete),
+                daemon=True,
+            )
+            feeder.start()
+        else:
+            self._feed(job, pending, None, on_result, on_complete)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _feed(self, job, pending, slots, on_result, on_complete):
+        for index, (fn, args) in pending:
+            if slots is not None:
+                slots.acquire()
+            try:
+                future = submit(fn, *args)
+            except Exception as e:
+                if slots is not None:
+                    slots.release()
+                self._enqueue(job, index, e, on_result, on_complete)
+                continue
+            job.futures.append(future)
+            future.add_done_callback(
+                lambda f, index=index: self._release_and_enqueue(job, index, f, slots, on_result, on_complete)
+            )
+
+    def _release_and_enqueue(self, job, index, future, slots, on_result, on_complete):
+        if slots is not None:
+            slots.release()
+        self._enqueue(job, index, future, on_result, on_complete)
+
+    def _enqueue(self, job, index, outcome, on_result, on_complete):
+        with self._lock:
+            if self._finisher is None:
+                self._finisher = threading.Thread(target=self._run_finisher, name='job-finisher', daemon=True)
+                self._finisher.start()
+        self._finished.put((job, index, outcome, on_result, on_complete))
+
+    def _run_finisher(self):
+        while True:
+            args = self._finished.get()
+            try:
+                self._finish(*args)
+            except Exception:
+                logger.exception('Job bookkeeping failed')
+
+    def _finish(self, job, index, outcome, on_result, on_complete):
+        item = job.items[index]
+        try:
+            if isinstance(outcome, Exception):
+                raise outcome
+            value = outcome.result() if outcome is not None else None
+            result = dict(item, status='completed')
+        except Exception as e:
+            result = dict(item, status='failed', error=str(e))
+        
+        if on_result and result['status'] == 'completed':
+            try:
+                on_result(job, index, result, value)
+            except Exception:
+                logger.exception('Post-processing failed for job %s item %s', job.id, index)
+        
+        with self._lock:
+            job.results[index] = result
+            done = all(r is not None for r in job.results)
+            if done:
+                job.completed_at = datetime.now().isoformat()
+        if done:
+            try:
+                if on_complete:
+                    on_complete(job)
+            finally:
+                job._done.set()
@@ -0,0 +1,537 @@
+import os
+import json
+import time
+import heapq
+import sqlite3
+import threading
+from collections import OrderedDict, Counter, deque
+from itertools import islice
+
+FILE_TTL = int(os.environ.get('FILE_TTL', 3600))
+HISTORY_LIMIT = int(os.environ.get('HISTORY_LIMIT', 10000))
+HISTORY_FIELDS = ('input_format', 'output_format')
+FILE_EVICTION_RANKS = {'output': 0, 'cache': 0, 'upload': 1}
+PINNED_FILE_KINDS = {'part'}
+
+class MemoryStateBackend:
+    def __init__(self, ttl=FILE_TTL, history_limit=HISTORY_LIMIT):
+        self.ttl = ttl
+        self.history_limit = history_limit
+        self._records = {'batch': OrderedDict(), 'job': OrderedDict(), 'upload': OrderedDict()}
+        self._history = deque(maxlen=history_limit)
+        self._history_seq = 0
+        self._history_counts = {field: Counter() for field in HISTORY_FIELDS}
+        self._files = {}
+        self._file_expiry = []
+        self._file_access = {rank: OrderedDict() for rank in sorted(set(FILE_EVICTION_RANKS.values()))}
+        self._inode_refs = Counter()
+        self._kind_files = Counter()
+        self._kind_bytes = Counter()
+        self._storage_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, kind, record_id):
+        with self._lock:
+            entry = self._records[kind].get(record_id)
+            if entry is None or entry[1] <= time.time():
+                return None
+            return json.loads(entry[0])
+
+    def put(self, kind, record_id, data):
+        payload = json.dumps(data)
+        with self._lock:
+            records = self._records[kind]
+            records.pop(record_id, None)
+            records[record_id] = (payload, time.time() + self.ttl)
+
+    def update(self, kind, record_id, **fields):
+        return self.modify(kind, record_id, lambda data: data.update(fields))
+
+    def modify(self, kind, record_id, change, refresh=False):
+        with self._lock:
+            records = self._records[kind]
+            entry = records.get(record_id)
+            if entry is None or entry[1] <= time.time():
+                return None
+            data = json.loads(entry[0])
+            change(data)
+            if refresh:
+                del records[record_id]
+                records[record_id] = (json.dumps(data), time.time() + self.ttl)
+            else:
+                records[record_id] = (json.dumps(data), entry[1])
+            return data
+
+    def delete(self, kind, record_id):
+        with self._lock:
+            return self._records[kind].pop(record_id, None) is not None
+
+    def add_history(self, entry):
+        with self._lock:
+            if len(self._history) == self._history.maxlen:
+                _, _, evicted = self._history[0]
+                for field, counts in self._history_counts.items():
+                    value = evicted.get(field) or ''
+                    counts[value] -= 1
+                    if counts[value] <= 0:
+                        del counts[value]
+            self._history_seq += 1
+            self._history.append((self._history_seq, time.time(), entry))
+            for field, counts in self._history_counts.items():
+                counts[entry.get(field) or ''] += 1
+
+    def list_history(self, limit=50, cursor=None, input_format=None, output_format=None, since=None, until=None):
+        with self._lock:
+            history = self._history
+            skip = 0
+            if cursor is not None and history:
+                skip = max(history[-1][0] - cursor + 1, 0)
+            page = []
+            for seq, created_at, entry in islice(reversed(history), skip, None):
+                if since is not None and created_at < since:
+                    break
+                if until is not None and created_at > until:
+                    continue
+                if input_format and entry.get('input_format') != input_format:
+                    continue
+                if output_format and entry.get('output_format') != output_format:
+                    continue
+                page.append((seq, entry))
+                if len(page) > limit:
+                    break
+        return history_page(page, limit)
+
+    def history_counts(self):
+        with self._lock:
+            return {field: dict(counts) for field, counts in self._history_counts.items()}
+
+    def clear_history(self):
+        with self._lock:
+            self._history = deque(maxlen=self.history_limit)
+            self._history_counts = {field: Counter() for field in HISTORY_FIELDS}
+
+    def expire(self, now=None):
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            for records in self._records.values():
+                while records:
+                    record_id, (_, expires_at) = next(iter(records.items()))
+                    if expires_at > now:
+                        break
+                    del records[record_id]
+                    removed += 1
+        return removed
+
+    def track_file(self, path, kind, size, expires_at=None, replace=True, inode=None):
+        with self._lock:
+            return self._track_file(path, kind, size, expires_at, replace, inode)
+
+    def reserve_file(self, path, kind, size, max_files, max_bytes):
+        with self._lock:
+            if self._kind_files[kind] >= max_files or self._kind_bytes[kind] + size > max_bytes:
+                return False
+            return self._track_file(path, kind, size)
+
+    def file_usage(self, kind):
+        with self._lock:
+            return self._kind_files[kind], self._kind_bytes[kind]
+
+    def _track_file(self, path, kind, size, expires_at=None, replace=True, inode=None):
+        now = time.time()
+        expires_at = now + self.ttl if expires_at is None else expires_at
+        inode = inode or path
+        if path in self._files:
+            if not replace:
+                return False
+            self._drop_file(path)
+        self._files[path] = (kind, size, expires_at, inode)
+        self._kind_files[kind] += 1
+        self._kind_bytes[kind] += size
+        heapq.heappush(self._file_expiry, (expires_at, path))
+        if kind not in PINNED_FILE_KINDS:
+            self._file_access[file_eviction_rank(kind)][path] = now
+            self._inode_refs[inode] += 1
+            if self._inode_refs[inode] == 1:
+                self._storage_bytes += size
+        if len(self._file_expiry) > 2 * len(self._files) + 64:
+            self._file_expiry = [(record[2], key) for key, record in self._files.items()]
+            heapq.heapify(self._file_expiry)
+        return True
+
+    def touch_file(self, path):
+        with self._lock:
+            if path not in self._files or self._files[path][0] in PINNED_FILE_KINDS:
+                return False
+            access = self._file_access[file_eviction_rank(self._files[path][0])]
+            access[path] = time.time()
+            access.move_to_end(path)
+            return True
+
+    def pop_expired_files(self, now=None, limit=1000):
+        now = time.time() if now is None else now
+        expired = []
+        with self._lock:
+            heap = self._file_expiry
+            while heap and heap[0][0] <= now and len(expired) < limit:
+                expires_at, path = heapq.heappop(heap)
+                record = self._files.get(path)
+                if record is not None and record[2] == expires_at:
+                    self._drop_file(path)
+                    expired.append(path)
+        return expired
+
+    def pop_eviction_candidates(self, excess):
+        evicted = []
+        freed = 0
+        with self._lock:
+            for access in self._file_access.values():
+                while access and freed < excess:
+                    path = next(iter(access))
+                    freed += self._drop_file(path)
+                    evicted.append(path)
+        return evicted
+
+    def forget_file(self, path):
+        with self._lock:
+            if path in self._files:
+                self._drop_file(path)
+
+    def storage_bytes(self):
+        with self._lock:
+            return self._storage_bytes
+
+    def _drop_file(self, path):
+        kind, size, _, inode = self._files.pop(path)
+        self._kind_files[kind] -= 1
+        self._kind_bytes[kind] -= size
+        if kind in PINNED_FILE_KINDS:
+            return 0
+        self._file_access[file_eviction_rank(kind)].pop(path, None)
+        self._inode_refs[inode] -= 1
+        if self._inode_refs[inode] > 0:
+            return 0
+        del self._inode_refs[inode]
+        self._storage_bytes -= size
+        return size
+
+class SQLiteStateBackend:
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS records ("
+        " kind TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL, expires_at REAL NOT NULL,"
+        " PRIMARY KEY (kind, id))",
+        "CREATE INDEX IF NOT EXISTS records_expires_at ON records (expires_at)",
+        "CREATE TABLE IF NOT EXISTS history ("
+        " seq INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL,"
+        " input_format TEXT, output_format TEXT, created_at REAL)",
+        "CREATE TABLE IF NOT EXISTS history_counts ("
+        " field TEXT NOT NULL, format TEXT NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (field, format))",
+        "CREATE TABLE IF NOT EXISTS files ("
+        " path TEXT PRIMARY KEY, kind TEXT NOT NULL, size INTEGER NOT NULL,"
+        " expires_at REAL NOT NULL, accessed_at REAL NOT NULL, eviction_rank INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS files_expires_at ON files (expires_at)",
+        "CREATE INDEX IF NOT EXISTS files_eviction ON files (eviction_rank, accessed_at)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('history_cleared_seq', 0)",
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('storage_bytes', 0)",
+    )
+    INDEXES = (
+        "CREATE INDEX IF NOT EXISTS history_input_format ON history (input_format, seq)",
+        "CREATE INDEX IF NOT EXISTS history_output_format ON history (output_format, seq)",
+        "CREATE INDEX IF NOT EXISTS history_created_at ON history (created_at)",
+        "CREATE INDEX IF NOT EXISTS files_inode ON files (inode)",
+        "CREATE INDEX IF NOT EXISTS files_kind ON files (kind)",
+    )
+
+    def __init__(self, path, ttl=FILE_TTL, history_limit=HISTORY_LIMIT):
+        self.path = path
+        self.ttl = ttl
+        self.history_limit = history_limit
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as db:
+            for statement in self.SCHEMA:
+                db.execute(statement)
+            columns = {row[1] for row in db.execute("PRAGMA table_info(history)")}
+            for column, column_type in (('input_format', 'TEXT'), ('output_format', 'TEXT'), ('created_at', 'REAL')):
+                if column not in columns:
+                    db.execute(f"ALTER TABLE history ADD COLUMN {column} {column_type}")
+            if 'inode' not in {row[1] for row in db.execute("PRAGMA table_info(files)")}:
+                db.execute("ALTER TABLE files ADD COLUMN inode TEXT")
+            for statement in self.INDEXES:
+                db.execute(statement)
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def get(self, kind, record_id):
+        row = self._connection().execute(
+            "SELECT data FROM records WHERE kind = ? AND id = ? AND expires_at > ?",
+            (kind, record_id, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, kind, record_id, data):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO records (kind, id, data, expires_at) VALUES (?, ?, ?, ?)",
+            (kind, record_id, json.dumps(data), time.time() + self.ttl),
+        )
+
+    def update(self, kind, record_id, **fields):
+        return self.modify(kind, record_id, lambda data: data.update(fields))
+
+    def modify(self, kind, record_id, change, refresh=False):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT data FROM records WHERE kind = ? AND id = ? AND expires_at > ?",
+                (kind, record_id, time.time()),
+            ).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            data = json.loads(row[0])
+            change(data)
+            if refresh:
+                db.execute(
+                    "UPDATE records SET data = ?, expires_at = ? WHERE kind = ? AND id = ?",
+                    (json.dumps(data), time.time() + self.ttl, kind, record_id),
+                )
+            else:
+                db.execute("UPDATE records SET data = ? WHERE kind = ? AND id = ?", (json.dumps(data), kind, record_id))
+            db.execute("COMMIT")
+            return data
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def delete(self, kind, record_id):
+        return self._connection().execute(
+            "DELETE FROM records WHERE kind = ? AND id = ?", (kind, record_id)
+        ).rowcount > 0
+
+    def add_history(self, entry):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            seq = db.execute(
+                "INSERT INTO history (data, input_format, output_format, created_at) VALUES (?, ?, ?, ?)",
+                (json.dumps(entry), entry.get('input_format'), entry.get('output_format'), time.time()),
+            ).lastrowid
+            for field in HISTORY_FIELDS:
+                db.execute(
+                    "INSERT INTO history_counts (field, format, count) VALUES (?, ?, 1)"
+                    " ON CONFLICT (field, format) DO UPDATE SET count = count + 1",
+                    (field, entry.get(field) or ''),
+                )
+            
+            oldest_kept = seq - self.history_limit
+            cleared_seq = self._cleared_seq(db)
+            for row in db.execute(
+                "SELECT input_format, output_format FROM history WHERE seq > ? AND seq <= ?",
+                (cleared_seq, oldest_kept),
+            ).fetchall():
+                for field, value in zip(HISTORY_FIELDS, row):
+                    db.execute(
+                        "UPDATE history_counts SET count = count - 1 WHERE field = ? AND format = ?",
+                        (field, value or ''),
+                    )
+            db.execute("DELETE FROM history WHERE seq <= ?", (oldest_kept,))
+            db.execute("DELETE FROM history_counts WHERE count <= 0")
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def list_history(self, limit=50, cursor=None, input_format=None, output_format=None, since=None, until=None):
+        db = self._connection()
+        clauses = ["seq > ?"]
+        params = [self._cleared_seq(db)]
+        for clause, value in (
+            ("seq < ?", cursor),
+            ("input_format = ?", input_format or None),
+            ("output_format = ?", output_format or None),
+            ("created_at >= ?", since),
+            ("created_at <= ?", until),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        rows = db.execute(
+            f"SELECT seq, data FROM history WHERE {' AND '.join(clauses)} ORDER BY seq DESC LIMIT ?",
+            params + [limit + 1],
+        ).fetchall()
+        return history_page([(seq, json.loads(data)) for seq, data in rows], limit)
+
+    def history_counts(self):
+        counts = {field: {} for field in HISTORY_FIELDS}
+        for field, value, count in self._connection().execute("SELECT field, format, count FROM history_counts"):
+            counts[field][value] = count
+        return counts
+
+    def clear_history(self):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "UPDATE meta SET value = (SELECT COALESCE(MAX(seq), 0) FROM history) WHERE key = 'history_cleared_seq'"
+            )
+            db.execute("DELETE FROM history_counts")
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _cleared_seq(db):
+        return db.execute("SELECT value FROM meta WHERE key = 'history_cleared_seq'").fetchone()[0]
+
+    def expire(self, now=None):
+        now = time.time() if now is None else now
+        return self._connection().execute("DELETE FROM records WHERE expires_at <= ?", (now,)).rowcount
+
+    def track_file(self, path, kind, size, expires_at=None, replace=True, inode=None):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            tracked = self._track_file(db, path, kind, size, expires_at, replace, inode)
+            db.execute("COMMIT")
+            return tracked
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def reserve_file(self, path, kind, size, max_files, max_bytes):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            count, used = self._file_usage(db, kind)
+            tracked = count < max_files and used + size <= max_bytes and self._track_file(db, path, kind, size)
+            db.execute("COMMIT")
+            return tracked
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def file_usage(self, kind):
+        return self._file_usage(self._connection(), kind)
+
+    @staticmethod
+    def _file_usage(db, kind):
+        return db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files WHERE kind = ?", (kind,)).fetchone()
+
+    def _track_file(self, db, path, kind, size, expires_at=None, replace=True, inode=None):
+        now = time.time()
+        expires_at = now + self.ttl if expires_at is None else expires_at
+        pinned = kind in PINNED_FILE_KINDS
+        inode = None if pinned else inode or path
+        if db.execute("SELECT 1 FROM files WHERE path = ?", (path,)).fetchone() is not None:
+            if not replace:
+                return False
+            self._drop_files(db, [path])
+        linked = pinned or db.execute("SELECT 1 FROM files WHERE inode = ? LIMIT 1", (inode,)).fetchone() is not None
+        db.execute(
+            "INSERT INTO files (path, kind, size, expires_at, accessed_at, eviction_rank, inode)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, kind, size, expires_at, now, file_eviction_rank(kind), inode),
+        )
+        if not linked:
+            db.execute("UPDATE meta SET value = value + ? WHERE key = 'storage_bytes'", (size,))
+        return True
+
+    def touch_file(self, path):
+        return self._connection().execute(
+            "UPDATE files SET accessed_at = ? WHERE path = ?", (time.time(), path)
+        ).rowcount > 0
+
+    def pop_expired_files(self, now=None, limit=1000):
+        now = time.time() if now is None else now
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            paths = [path for path, in db.execute(
+                "SELECT path FROM files WHERE expires_at <= ? ORDER BY expires_at LIMIT ?", (now, limit)
+            ).fetchall()]
+            self._drop_files(db, paths)
+            db.execute("COMMIT")
+            return paths
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def pop_eviction_candidates(self, excess):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            evicted = []
+            freed = 0
+            while freed < excess:
+                paths = [path for path, in db.execute(
+                    "SELECT path FROM files WHERE eviction_rank >= 0 ORDER BY eviction_rank, accessed_at LIMIT 100"
+                ).fetchall()]
+                if not paths:
+                    break
+                for path in paths:
+                    if freed >= excess:
+                        break
+                    freed += self._drop_files(db, [path])
+                    evicted.append(path)
+            db.execute("COMMIT")
+            return evicted
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def forget_file(self, path):
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            self._drop_files(db, [path])
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def storage_bytes(self):
+        return self._connection().execute("SELECT value FROM meta WHERE key = 'storage_bytes'").fetchone()[0]
+
+    @staticmethod
+    def _drop_files(db, paths):
+        freed = 0
+        for path in paths:
+            row = db.execute("SELECT size, inode, eviction_rank FROM files WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                continue
+            db.execute("DELETE FROM files WHERE path = ?", (path,))
+            size, inode, eviction_rank = row
+            if eviction_rank >= 0 and db.execute("SELECT 1 FROM files WHERE inode = ? LIMIT 1", (inode or path,)).fetchone() is None:
+                freed += size
+        db.execute("UPDATE meta SET value = value - ? WHERE key = 'storage_bytes'", (freed,))
+        return freed
+
+def file_eviction_rank(kind):
+    if kind in PINNED_FILE_KINDS:
+        return -1
+    return FILE_EVICTION_RANKS.get(kind, max(FILE_EVICTION_RANKS.values()))
+
+def history_page(rows, limit):
+    page = rows[:limit]
+    next_cursor = page[-1][0] if len(rows) > limit else None
+    return [entry for _, entry in reversed(page)], next_cursor
+
+def create_state_backend(backend=None, path=None):
+    backend = backend or os.environ.get('STATE_BACKEND', 'sqlite')
+    if backend == 'memory':
+        return MemoryStateBackend()
+    if backend == 'sqlite':
+        return SQLiteStateBackend(path or os.environ.get('STATE_DB_PATH', 'state/state.db'))
+    raise ValueError(f"Unknown state backend: {backend}")
@@ -69,7 +69,7 @@ convertBtn.addEventListener('click', async () => {
         updateProgress(40);
         progressText.textContent = 'Converting file...';
         
-        const response = await fetch('/api/convert', {
+        const response = await fetch('/api/jobs', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -80,15 +80,16 @@ convertBtn.addEventListener('click', async () => {
             })
         });
         
-        updateProgress(70);
-        progressText.textContent = 'Finalizing...';
-        
-        const data = await response.json();
+        const submitted = await response.json();
         
         if (!response.ok) {
-            throw new Error(data.error || 'Conversion failed');
+            throw new Error(submitted.error || 'Conversion failed');
         }
         
+        updateProgress(70);
+        
+        const data = await waitForJob(submitted.status_url);
+        
         updateProgress(100);
         progressText.textContent = 'Complete!';
         
@@ -102,10 +103,201 @@ convertBtn.addEventListener('click', async () => {
     }
 });
 
+const JOB_POLL_INTERVAL = 1000;
+
+async function waitForJob(statusUrl) {
+    while (true) {
+        const response = await fetch(statusUrl);
+        const data = await response.json();
+        
+        if (!response.ok) {
+            throw new Error(data.error || 'Conversion failed');
+        }
+        
+        const job = data.job;
+        if (job.status === 'completed') {
+            return job;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Conversion failed');
+        }
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+    }
+}
+
 function getFileExtension(filename) {
     return filename.split('.').pop().toLowerCase();
 }
 
+const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+const CHUNK_UPLOAD_CONCURRENCY = 4;
+const CHUNK_UPLOAD_RETRIES = 3;
+
+async function readJsonResponse(response) {
+    let data;
+    try {
+        const text = await response.text();
+        if (!text) {
+            throw new Error('Empty response from server');
+        }
+        data = JSON.parse(text);
+    } catch (e) {
+        if (e instanceof SyntaxError) {
+            throw new Error(`Server error: ${response.status} ${response.statusText}. Response: ${e.message}`);
+        }
+        throw new Error(`Failed to parse server response: ${e.message}`);
+    }
+    return data;
+}
+
+async function uploadWholeFile(file) {
+    const formData = new FormData();
+    formData.append('file', file);
+    
+    const response = await fetch('/api/upload', {
+        method: 'POST',
+        body: formData
+    });
+    
+    const data = await readJsonResponse(response);
+    
+    if (!response.ok) {
+        throw new Error(data.error || `Upload failed: ${response.status} ${response.statusText}`);
+    }
+    
+    if (!data.success) {
+        throw new Error(data.error || 'Upload was not successful');
+    }
+    
+    return data;
+}
+
+function chunkedUploadKey(file) {
+    return `chunkedUpload:${file.name}:${file.size}:${file.lastModified}`;
+}
+
+async function startChunkedUpload(file) {
+    const key = chunkedUploadKey(file);
+    const savedId = localStorage.getItem(key);
+    if (savedId) {
+        const response = await fetch(`/api/uploads/${savedId}`);
+        if (response.ok) {
+            const status = await response.json();
+            if (!status.file_id) {
+                return status;
+            }
+        } else if (response.status !== 404 && response.status !== 410) {
+            const data = await readJsonResponse(response);
+            throw new Error(data.error || `Upload failed: ${response.status} ${response.statusText}`);
+        }
+        localStorage.removeItem(key);
+    }
+    
+    const response = await fetch('/api/uploads', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            filename: file.name,
+            size: file.size
+        })
+    });
+    const status = await readJsonResponse(response);
+    if (!response.ok) {
+        throw new Error(status.error || `Upload failed: ${response.status} ${response.statusText}`);
+    }
+    localStorage.setItem(key, status.upload_id);
+    return status;
+}
+
+async function uploadChunk(file, status, index) {
+    const start = index * status.chunk_size;
+    const chunk = file.slice(start, Math.min(start + status.chunk_size, file.size));
+    
+    for (let attempt = 1; ; attempt++) {
+        try {
+            const response = await fetch(`/api/uploads/${status.upload_id}/chunks/${index}`, {
+                method: 'PUT',
+                headers: {
+                    'Content-Type': 'application/octet-stream',
+                },
+                body: chunk
+            });
+            if (response.ok) {
+                return;
+            }
+            const data = await readJsonResponse(response);
+            if (response.status < 500 || attempt >= CHUNK_UPLOAD_RETRIES) {
+                const error = new Error(data.error || `Chunk ${index} failed: ${response.status}`);
+                error.status = response.status;
+                throw error;
+            }
+        } catch (error) {
+            if (!(error instanceof TypeError) || attempt >= CHUNK_UPLOAD_RETRIES) {
+                throw error;
+            }
+        }
+        await new Promise(resolve => setTimeout(resolve, 500 * attempt));
+    }
+}
+
+function isUploadGone(error) {
+    return error.status === 404 || error.status === 410;
+}
+
+async function uploadFileInChunks(file, restarted = false) {
+    const status = await startChunkedUpload(file);
+    const pending = [];
+    for (let index = 0; index < status.chunk_count; index++) {
+        if (status.received[index] !== '1') {
+            pending.push(index);
+        }
+    }
+    
+    if (window.progressInterval) {
+        clearInterval(window.progressInterval);
+        window.progressInterval = null;
+    }
+    const total = status.chunk_count;
+    let done = total - pending.length;
+    updateProgress(Math.round(done / total * 90));
+    
+    const workers = [];
+    for (let i = 0; i < Math.min(CHUNK_UPLOAD_CONCURRENCY, pending.length); i++) {
+        workers.push((async () => {
+            while (pending.length > 0) {
+                await uploadChunk(file, status, pending.shift());
+                done++;
+                updateProgress(Math.round(done / total * 90));
+                progressText.textContent = `Uploading file... ${done}/${total} chunks`;
+            }
+        })());
+    }
+    try {
+        await Promise.all(workers);
+    } catch (error) {
+        if (isUploadGone(error) && !restarted) {
+            localStorage.removeItem(chunkedUploadKey(file));
+            return uploadFileInChunks(file, true);
+        }
+        throw error;
+    }
+    
+    progressText.textContent = 'Processing file...';
+    const response = await fetch(`/api/uploads/${status.upload_id}/complete`, {
+        method: 'POST'
+    });
+    const data = await readJsonResponse(response);
+    localStorage.removeItem(chunkedUploadKey(file));
+    
+    if (!response.ok || !data.success) {
+        throw new Error(data.error || `Upload failed: ${response.status} ${response.statusText}`);
+    }
+    
+    return data;
+}
+
 async function handleFile(file) {
     const extension = getFileExtension(file.name);
     const supportedExtensions = ['txt', 'pdf', 'docx', 'html', 'json', 'csv', 'xml', 'rtf', 'epub', 'odt'];
@@ -118,40 +310,14 @@ async function handleFile(file) {
     hideError();
     hideResult();
     
-    const formData = new FormData();
-    formData.append('file', file);
-    
     try {
         showProgress();
         progressText.textContent = 'Uploading file...';
         updateProgress(20);
         
-        const response = await fetch('/api/upload', {
-            method: 'POST',
-            body: formData
-        });
-        
-        let data;
-        try {
-            const text = await response.text();
-            if (!text) {
-                throw new Error('Empty response from server');
-            }
-            data = JSON.parse(text);
-        } catch (e) {
-            if (e instanceof SyntaxError) {
-                throw new Error(`Server error: ${response.status} ${response.statusText}. Response: ${e.message}`);
-            }
-            throw new Error(`Failed to parse server response: ${e.message}`);
-        }
-        
-        if (!response.ok) {
-            throw new Error(data.error || `Upload failed: ${response.status} ${response.statusText}`);
-        }
-        
-        if (!data.success) {
-            throw new Error(data.error || 'Upload was not successful');
-        }
+        const data = file.size > CHUNKED_UPLOAD_THRESHOLD
+            ? await uploadFileInChunks(file)
+            : await uploadWholeFile(file);
         
         updateProgress(100);
         uploadedFileId = data.file_id;